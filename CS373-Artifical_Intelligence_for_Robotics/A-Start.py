@@ -93,6 +93,20 @@ def search(grid, init, goal, cost, heuristic):
     return expand
 
 
-expand = search(grid, init, goal, cost, heuristic)
-for i in range(len(expand)):
-        print(expand[i])
\ No newline at end of file
+if __name__ == '__main__':
+    expand = search(grid, init, goal, cost, heuristic)
+    for i in range(len(expand)):
+            print(expand[i])
+
+    # Uncomment the following lines to run the heap based planner of
+    # common/planning.py; it keeps its buffers between queries and also
+    # plans on 8-connected grids (connectivity=8) and weighted cells
+    # (cell_cost=...). With cache=HeuristicCache() it replaces the
+    # hand-written heuristic by the exact distance to the goal, computed once
+    # per map and goal.
+    #
+    # from common.planning import GridPlanner
+    # planner = GridPlanner(grid, cost)
+    # print(planner.search(init, goal, heuristic))
+    # for row in planner.expand_grid():
+    #     print(row)
@@ -75,7 +75,8 @@ def search(grid,init,goal,cost):
     
     return expand
 
-expand = search(grid,init,goal,cost)
+if __name__ == '__main__':
+    expand = search(grid,init,goal,cost)
 
-for i in range(len(expand)):
-    print(expand[i])
\ No newline at end of file
+    for i in range(len(expand)):
+        print(expand[i])
\ No newline at end of file
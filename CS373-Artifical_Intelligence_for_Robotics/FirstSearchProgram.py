@@ -85,7 +85,8 @@ def search(grid,init,goal,cost):
                             print [g2, x2, y2]
                             closed[x2][y2] = 1 # never expand agin
 
-search(grid,init,goal,cost)
+if __name__ == '__main__':
+    search(grid,init,goal,cost)
 
 # This is my former solution
 # def search(grid,init,goal,cost):
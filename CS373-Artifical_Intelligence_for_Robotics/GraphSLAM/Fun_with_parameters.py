@@ -45,6 +45,10 @@ class plan:
     # --------
     #
     # make heuristic function for a grid
+    #
+    # For many queries on one map, common/planning.py keeps exact
+    # distance fields per (map, goal) in a HeuristicCache instead of
+    # recomputing the heuristic for every plan.
 
     def make_heuristic(self, grid, goal, cost):
         self.heuristic = [[0 for row in range(len(grid[0]))]
@@ -543,8 +547,9 @@ d_gain = 6.0
 
 ###################################
 
-print main(grid, init, goal, steering_noise, distance_noise, measurement_noise,
-           weight_data, weight_smooth, p_gain, d_gain)
+if __name__ == '__main__':
+    print main(grid, init, goal, steering_noise, distance_noise, measurement_noise,
+               weight_data, weight_smooth, p_gain, d_gain)
 
 
 
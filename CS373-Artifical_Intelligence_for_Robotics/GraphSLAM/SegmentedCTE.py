@@ -147,6 +147,11 @@ class plan:
     # this is the smoothing function
     #
 
+    # common/smoothing.py solves the simultaneous update of these three
+    # terms in one banded solve: smooth(self.path, weight_data,
+    # weight_smooth, second_order=True). This loop applies them one after
+    # the other and settles slightly elsewhere (a few 0.01 apart).
+
     def smooth(self, weight_data=0.1, weight_smooth=0.1,
                tolerance=0.000001):
 
@@ -448,6 +453,8 @@ def run(grid, goal, spath, params, printflag=False, speed=0.1, timeout=1000):
         estimate = filter.get_position()
 
         ### ENTER CODE HERE
+        # (common/path_index.py: PathIndex(spath).locate(estimate, index)
+        # returns cte, arc length and segment without stepping index)
         dx = spath[index+1][0] - spath[index][0]
         dy = spath[index+1][1] - spath[index][1]
         drx = estimate[0] - spath[index][0]
@@ -521,9 +528,11 @@ weight_smooth = 0.2
 p_gain = 2.0
 d_gain = 6.0
 
-print main(grid, init, goal, steering_noise, distance_noise, measurement_noise,
-           weight_data, weight_smooth, p_gain, d_gain)
 
+# common/tuning.py evaluates the K runs of every candidate in parallel
+# and caches them (Python 3): with cost(params, seed) seeding random and
+# scoring one main(...) run as below,
+#   Tuner(cost, seeds=range(10)).tune(init_params, tol=0.0000001, shrink=0.5)
 
 def twiddle(init_params):
     n_params = len(init_params)
@@ -586,4 +595,9 @@ def twiddle(init_params):
     print ' '
     return params
 
-# twiddle([weight_data, weight_smooth, p_gain, d_gain])
+
+if __name__ == '__main__':
+    print main(grid, init, goal, steering_noise, distance_noise, measurement_noise,
+               weight_data, weight_smooth, p_gain, d_gain)
+
+    # twiddle([weight_data, weight_smooth, p_gain, d_gain])
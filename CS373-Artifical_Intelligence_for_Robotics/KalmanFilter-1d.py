@@ -19,12 +19,13 @@ motion_sig = 2.
 mu = 0.
 sig = 10000.
 
-#Please print out ONLY the final values of the mean
-#and the variance in a list [mu, sig]. 
+if __name__ == '__main__':
+    #Please print out ONLY the final values of the mean
+    #and the variance in a list [mu, sig]. 
 
-# Insert code here
-for m in range(len(measurements)):
-    mu, sig = update(mu, sig, measurements[m], measurement_sig)
-    mu, sig = predict(mu, sig, motion[m], motion_sig)
+    # Insert code here
+    for m in range(len(measurements)):
+        mu, sig = update(mu, sig, measurements[m], measurement_sig)
+        mu, sig = predict(mu, sig, motion[m], motion_sig)
 
-print [mu, sig]
+    print [mu, sig]
@@ -190,6 +190,16 @@ def optimum_policy2D(grid, init, goal, cost):
     return policy2D
 '''
 
-policy = optimum_policy2D(grid, init,  goal, cost)
-for i in range(len(policy)):
-    print(policy[i])
+if __name__ == '__main__':
+    policy = optimum_policy2D(grid, init,  goal, cost)
+    for i in range(len(policy)):
+        print(policy[i])
+
+    # Uncomment the following lines to plan with the lattice planner of
+    # common/lattice.py (Dijkstra over integer states, also for 8 headings).
+    #
+    # from common.lattice import LatticePlanner
+    # planner = LatticePlanner(grid, cost, action, action_name)
+    # planner.plan(goal)
+    # for row in planner.policy2D(init):
+    #     print(row)
@@ -78,6 +78,10 @@ def  sense(p, colors, measurement, sensor_right):
     show(aux)
     return aux
 
+# The same filter on NumPy arrays, without printing every step:
+# common/histogram.py localize(colors, measurements, motions,
+# sensor_right, p_move) returns the belief array; HistogramFilter keeps
+# it between calls for streaming use.
 def localize(colors,measurements,motions,sensor_right,p_move):
     # initializes p to a uniform distribution over a grid of the same dimensions as colors
     pinit = 1.0 / float(len(colors)) / float(len(colors[0]))
@@ -112,8 +116,10 @@ colors = [['R','G','G','R','R'],
           ['R','R','R','R','R']]
 measurements = ['G','G','G','G','G']
 motions = [[0,0],[0,1],[1,0],[1,0],[0,1]]
-if len(measurements) != len(motions):
-    raise ValueError, "error in size of measurement/motion vector"
-p = localize(colors,measurements,motions,sensor_right = 0.7, p_move = 0.8)
-print "Final Distribution: "
-show(p) # displays your answer
+
+if __name__ == '__main__':
+    if len(measurements) != len(motions):
+        raise ValueError, "error in size of measurement/motion vector"
+    p = localize(colors,measurements,motions,sensor_right = 0.7, p_move = 0.8)
+    print "Final Distribution: "
+    show(p) # displays your answer
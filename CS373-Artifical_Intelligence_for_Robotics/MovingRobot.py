@@ -114,10 +114,11 @@ def eval(r, p):
 
 ####   DON'T MODIFY ANYTHING ABOVE HERE! ENTER CODE BELOW ####
 
-myrobot = robot()
-myrobot.set_noise(5., 0.1, 5.)
-myrobot.set(30, 50, pi/2)
-myrobot = myrobot.move(-pi/2, 15)
-print myrobot.sense()
-myrobot = myrobot.move(-pi/2, 10.)
-print myrobot.sense()
\ No newline at end of file
+if __name__ == '__main__':
+    myrobot = robot()
+    myrobot.set_noise(5., 0.1, 5.)
+    myrobot.set(30, 50, pi/2)
+    myrobot = myrobot.move(-pi/2, 15)
+    print myrobot.sense()
+    myrobot = myrobot.move(-pi/2, 10.)
+    print myrobot.sense()
\ No newline at end of file
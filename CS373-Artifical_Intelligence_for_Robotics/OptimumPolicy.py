@@ -65,6 +65,15 @@ def optimum_policy(grid,goal,cost):
     return policy
 
 
-policy = optimum_policy(grid, goal, cost)
-for i in range(len(policy)):
-    print(policy[i])
+if __name__ == '__main__':
+    policy = optimum_policy(grid, goal, cost)
+    for i in range(len(policy)):
+        print(policy[i])
+
+
+    # Uncomment the following lines to compute the policy with the NumPy
+    # engine of common/value_iteration.py.
+    #
+    # from common.value_iteration import optimum_policy as fast_optimum_policy
+    # for row in fast_optimum_policy(grid, goal, cost).tolist():
+    #     print(row)
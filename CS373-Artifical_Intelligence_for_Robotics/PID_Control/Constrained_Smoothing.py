@@ -15,7 +15,6 @@
 # Feel free to use the provided solution_check function
 # to test your code. You can find it at the bottom.
 #
-import matplotlib.pyplot as plt
 
 ######################## ENTER CODE BELOW HERE #########################
 path = [[0, 0],
@@ -41,6 +40,10 @@ fix = [1, 0, 0, 0, 0, 0, 1, 0, 0, 1, 0, 0, 0, 0, 0, 1, 0, 0]
 
 
 
+# common/smoothing.py solves for the point where this loop stops in one
+# sparse solve, keeping the fixed points:
+#   smooth(path, weight_data, weight_smooth, fix=fix, cyclic=True, second_order=True)
+
 def smooth(path, fix, weight_data=0.0, weight_smooth=0.1, tolerance=0.00001):
     #
     # Enter code here.
@@ -67,22 +70,6 @@ def smooth(path, fix, weight_data=0.0, weight_smooth=0.1, tolerance=0.00001):
                     change += abs(aux - newpath[i][j])
     return newpath
 
-newpath = smooth(path, fix)
-for i in range(len(path)):
-    print '['+ ', '.join('%.3f'%x for x in path[i]) +'] -> ['+ ', '.join('%.3f'%x for x in newpath[i]) +']'
-
-path_x = [path[row][0] for row in range(len(path))]
-path_y = [path[row][1] for row in range(len(path))]
-path_x.append(path[0][0])
-path_y.append(path[0][1])
-plt.plot(path_x, path_y, 'g', label='path')
-
-newpath_x = [newpath[row][0] for row in range(len(newpath))]
-newpath_y = [newpath[row][1] for row in range(len(newpath))]
-newpath_x.append(path[0][0])
-newpath_y.append(path[0][1])
-plt.plot(newpath_x, newpath_y, 'r', label='newpath')
-plt.show()
 
 # --------------
 # Testing Instructions
@@ -203,4 +190,23 @@ updated once per iteration, or else the intermediate updates made to newpath[i][
 will affect the final answer.\n'''
 
 
-solution_check(smooth)
+if __name__ == '__main__':
+    import matplotlib.pyplot as plt
+    newpath = smooth(path, fix)
+    for i in range(len(path)):
+        print '['+ ', '.join('%.3f'%x for x in path[i]) +'] -> ['+ ', '.join('%.3f'%x for x in newpath[i]) +']'
+
+    path_x = [path[row][0] for row in range(len(path))]
+    path_y = [path[row][1] for row in range(len(path))]
+    path_x.append(path[0][0])
+    path_y.append(path[0][1])
+    plt.plot(path_x, path_y, 'g', label='path')
+
+    newpath_x = [newpath[row][0] for row in range(len(newpath))]
+    newpath_y = [newpath[row][1] for row in range(len(newpath))]
+    newpath_x.append(path[0][0])
+    newpath_y.append(path[0][1])
+    plt.plot(newpath_x, newpath_y, 'r', label='newpath')
+    plt.show()
+
+    solution_check(smooth)
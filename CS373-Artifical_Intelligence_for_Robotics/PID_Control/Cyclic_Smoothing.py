@@ -57,6 +57,9 @@ path = [[0, 0],
 # larger to decrease run time.
 #
 
+# common/smoothing.py solves for the point where this loop stops in one
+# sparse solve: smooth(path, weight_data, weight_smooth, cyclic=True)
+
 def smooth(path, weight_data=0.1, weight_smooth=0.1, tolerance=0.00001):
     #
     # Enter code here
@@ -74,13 +77,6 @@ def smooth(path, weight_data=0.1, weight_smooth=0.1, tolerance=0.00001):
     return newpath
 
 
-# thank you - EnTerr - for posting this on our discussion forum
-
-newpath = smooth(path)
-for i in range(len(path)):
-   print '['+ ', '.join('%.3f'%x for x in path[i]) +'] -> ['+ ', '.join('%.3f'%x for x in newpath[i]) +']'
-
-
 ##### TESTING ######
 
 # --------------------------------------------------
@@ -193,5 +189,13 @@ answer2 = [[1.2222234770374059, 0.4444422843711052],
            [0.44444210978390364, 1.2222211690821811],
            [0.8888882042812255, 0.8888870211766268]]
 
-# solution_check(smooth(testpath1), answer1)
-# solution_check(smooth(testpath2), answer2)
\ No newline at end of file
+
+if __name__ == '__main__':
+    # thank you - EnTerr - for posting this on our discussion forum
+
+    newpath = smooth(path)
+    for i in range(len(path)):
+       print '['+ ', '.join('%.3f'%x for x in path[i]) +'] -> ['+ ', '.join('%.3f'%x for x in newpath[i]) +']'
+
+    # solution_check(smooth(testpath1), answer1)
+    # solution_check(smooth(testpath2), answer2)
@@ -15,7 +15,6 @@
 
 import random
 import numpy as np
-import matplotlib.pyplot as plt
 
 
 # ------------------------------------------------
@@ -117,10 +116,6 @@ def run_p(robot, tau, n=100, speed=1.0):
     return x_trajectory, y_trajectory
 
 
-robot = Robot()
-robot.set(0, 1, 0)
-
-
 def run(robot, tau_p, tau_d, n=100, speed=1.0):
     x_trajectory = []
     y_trajectory = []
@@ -136,10 +131,15 @@ def run(robot, tau_p, tau_d, n=100, speed=1.0):
     return x_trajectory, y_trajectory
 
 
-x_trajectory, y_trajectory = run(robot, 0.2, 3.0)
-n = len(x_trajectory)
+if __name__ == '__main__':
+    import matplotlib.pyplot as plt
+    robot = Robot()
+    robot.set(0, 1, 0)
+
+    x_trajectory, y_trajectory = run(robot, 0.2, 3.0)
+    n = len(x_trajectory)
 
-fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8, 8))
-ax1.plot(x_trajectory, y_trajectory, 'g', label='PD controller')
-ax1.plot(x_trajectory, np.zeros(n), 'r', label='reference')
-plt.show()
\ No newline at end of file
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8, 8))
+    ax1.plot(x_trajectory, y_trajectory, 'g', label='PD controller')
+    ax1.plot(x_trajectory, np.zeros(n), 'r', label='reference')
+    plt.show()
\ No newline at end of file
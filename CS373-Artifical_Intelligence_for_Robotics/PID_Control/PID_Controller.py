@@ -16,7 +16,6 @@
 
 import random
 import numpy as np
-import matplotlib.pyplot as plt
 
 # ------------------------------------------------
 #
@@ -103,11 +102,6 @@ class Robot(object):
 #
 # run - does a single control run
 
-robot = Robot()
-robot.set(0, 1, 0)
-robot.set_steering_drift(10.0/180.*np.pi)
-
-
 def run(robot, tau_p, tau_d, tau_i, n=100, speed=1.0):
     x_trajectory = []
     y_trajectory = []
@@ -129,10 +123,25 @@ def run(robot, tau_p, tau_d, tau_i, n=100, speed=1.0):
     return x_trajectory, y_trajectory
 
 
-x_trajectory, y_trajectory = run(robot, 0.2, 3.0, 0.004)
-n = len(x_trajectory)
-
-fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8,8))
-ax1.plot(x_trajectory, y_trajectory, 'g', label='PID controller')
-ax1.plot(x_trajectory, np.zeros(n), 'r', label='reference')
-plt.show()
\ No newline at end of file
+if __name__ == '__main__':
+    import matplotlib.pyplot as plt
+    robot = Robot()
+    robot.set(0, 1, 0)
+    robot.set_steering_drift(10.0/180.*np.pi)
+
+    x_trajectory, y_trajectory = run(robot, 0.2, 3.0, 0.004)
+    n = len(x_trajectory)
+
+    # Uncomment the following lines to run the P, PD and PID controllers of
+    # this lesson in one vectorized pass (common/pid.py).
+    #
+    # import sys, os
+    # sys.path.append(os.pardir)
+    # from common.pid import make_robots, run as run_batch
+    # robots = make_robots(3, drift=10.0 / 180.0 * np.pi)
+    # xs, ys, ctes = run_batch(robots, [[0.2, 3.0, 0.004], [0.2, 3.0, 0.0], [0.2, 0.0, 0.0]], n)
+
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8,8))
+    ax1.plot(x_trajectory, y_trajectory, 'g', label='PID controller')
+    ax1.plot(x_trajectory, np.zeros(n), 'r', label='reference')
+    plt.show()
\ No newline at end of file
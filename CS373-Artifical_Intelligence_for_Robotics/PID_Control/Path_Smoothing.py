@@ -36,6 +36,10 @@ path = [[0, 0],
         [4, 4]]
 
 
+# common/smoothing.py solves for the point where this loop stops in one
+# banded solve: smooth(path, weight_data, weight_smooth)
+# and StreamingSmoother there smooths paths that keep growing.
+
 def smooth(path, weight_data=0.5, weight_smooth=0.1, tolerance=0.000001):
     # Make a deep copy of path into newpath
     newpath = deepcopy(path)
@@ -55,4 +59,5 @@ def smooth(path, weight_data=0.5, weight_smooth=0.1, tolerance=0.000001):
     return newpath  # Leave this line for the grader!
 
 
-printpaths(path, smooth(path))
+if __name__ == '__main__':
+    printpaths(path, smooth(path))
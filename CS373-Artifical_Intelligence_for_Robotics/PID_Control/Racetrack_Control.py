@@ -131,6 +131,9 @@ class robot:
 
     ############## ONLY ADD / MODIFY CODE BELOW THIS LINE ####################
 
+    # common/path_index.py computes the same cte (and the arc length) for
+    # many positions at once on any polyline, e.g.
+    #   PathIndex(racetrack(radius), cyclic=True).project(points)
     def cte(self, radius):
         #
         #
@@ -140,7 +143,7 @@ class robot:
         if self.x < radius:
             cte = sqrt((self.x - radius)**2+(self.y - radius)**2)-radius
         elif self.x > 3.0 * radius:
-            cte = sqrt((self-3.0*radius)**2+self.y-radius)-radius
+            cte = sqrt((self.x - 3.0*radius)**2+(self.y - radius)**2)-radius
         elif self.y > radius:
             cte = self.y -2.0*radius
         else:
@@ -182,7 +185,8 @@ def run(params, radius, printflag=False):
     return err / float(N)
 
 
-radius = 25.0
-params = [10.0, 15.0, 0]
-err = run(params, radius, True)
-print '\nFinal parameters: ', params, '\n ->', err
+if __name__ == '__main__':
+    radius = 25.0
+    params = [10.0, 15.0, 0]
+    err = run(params, radius, True)
+    print '\nFinal parameters: ', params, '\n ->', err
@@ -16,7 +16,6 @@
 
 import random
 import numpy as np
-import matplotlib.pyplot as plt
 
 
 # ------------------------------------------------
@@ -138,6 +137,12 @@ def run(robot, params, n=100, speed=1.0):
     return x_trajectory, y_trajectory, err / n
 
 
+# common/tuning.py runs the same search in parallel (Python 3): both
+# sides p[i] +- dp[i] of a coordinate go to a process pool, runs are cached by
+# (params, seed), and target / max_rounds / patience stop early:
+#   Tuner(cost, workers=4).tune([0.0, 0.0, 0.0], tol=0.001)
+# with cost(params, seed) returning run(make_robot(), params)[2].
+
 # Make this tolerance bigger if you are timing out!
 def twiddle(tol=0.001):
     # Don't forget to call `make_robot` before every call of `run`!
@@ -171,14 +176,16 @@ def twiddle(tol=0.001):
     return p, best_err
 
 
-params, err = twiddle()
-print("Final twiddle error = {}".format(err))
-print  params
-robot = make_robot()
-x_trajectory, y_trajectory, err = run(robot, params)
-n = len(x_trajectory)
+if __name__ == '__main__':
+    import matplotlib.pyplot as plt
+    params, err = twiddle()
+    print("Final twiddle error = {}".format(err))
+    print  params
+    robot = make_robot()
+    x_trajectory, y_trajectory, err = run(robot, params)
+    n = len(x_trajectory)
 
-fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8, 8))
-ax1.plot(x_trajectory, y_trajectory, 'g', label='Twiddle PID controller')
-ax1.plot(x_trajectory, np.zeros(n), 'r', label='reference')
-plt.show()
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8, 8))
+    ax1.plot(x_trajectory, y_trajectory, 'g', label='Twiddle PID controller')
+    ax1.plot(x_trajectory, np.zeros(n), 'r', label='reference')
+    plt.show()
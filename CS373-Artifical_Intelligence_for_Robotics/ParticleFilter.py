@@ -104,43 +104,44 @@ def eval(r, p):
 #print myrobot.sense()
 
 ####   DON'T MODIFY ANYTHING ABOVE HERE! ENTER/MODIFY CODE BELOW ####
-myrobot = robot()
-myrobot = myrobot.move(0.1, 5.0)
-Z = myrobot.sense()
-N = 1000
-T = 10 #Leave this as 10 for grading purposes.
-
-p = []
-for i in range(N):
-    r = robot()
-    r.set_noise(0.05, 0.05, 5.0)
-    p.append(r)
-
-for t in range(T):
+if __name__ == '__main__':
+    myrobot = robot()
     myrobot = myrobot.move(0.1, 5.0)
     Z = myrobot.sense()
+    N = 1000
+    T = 10 #Leave this as 10 for grading purposes.
 
-    p2 = []
+    p = []
     for i in range(N):
-        p2.append(p[i].move(0.1, 5.0))
-    p = p2
+        r = robot()
+        r.set_noise(0.05, 0.05, 5.0)
+        p.append(r)
 
-    w = []
-    for i in range(N):
-        w.append(p[i].measurement_prob(Z))
+    for t in range(T):
+        myrobot = myrobot.move(0.1, 5.0)
+        Z = myrobot.sense()
 
-    p3 = []
-    index = int(random.random() * N)
-    beta = 0.0
-    mw = max(w)
-    for i in range(N):
-        beta += random.random() * 2.0 * mw
-        while beta > w[index]:
-            beta -= w[index]
-            index = (index + 1) % N
-        p3.append(p[index])
-    p = p3
-    #enter code here, make sure that you output 10 print statements.
-    print eval(myrobot, p)
+        p2 = []
+        for i in range(N):
+            p2.append(p[i].move(0.1, 5.0))
+        p = p2
+
+        w = []
+        for i in range(N):
+            w.append(p[i].measurement_prob(Z))
+
+        p3 = []
+        index = int(random.random() * N)
+        beta = 0.0
+        mw = max(w)
+        for i in range(N):
+            beta += random.random() * 2.0 * mw
+            while beta > w[index]:
+                beta -= w[index]
+                index = (index + 1) % N
+            p3.append(p[index])
+        p = p3
+        #enter code here, make sure that you output 10 print statements.
+        print eval(myrobot, p)
 
 
@@ -76,7 +76,64 @@ todo = [2, 1]
 # ----------------------------------------
 # modify code below
 # ----------------------------------------
+#
+# One Dijkstra from the dropzone gives the distance of every box (a box
+# is entered from its cheapest free neighbour); a delivery costs twice
+# that. Picking a box frees its cell, and the distances are repaired by
+# a Dijkstra started from that cell only. common/warehouse.py does the
+# same and also caches the distances per warehouse layout.
+#
 def plan(warehouse, dropzone, todo):
+    import heapq
+
+    rows = len(warehouse)
+    cols = len(warehouse[0])
+    delta = [[-1, 0], [0, -1], [1, 0], [0, 1],
+             [-1, -1], [1, -1], [1, 1], [-1, 1]]
+    step = [1, 1, 1, 1, 1.5, 1.5, 1.5, 1.5]
+
+    free = [[warehouse[x][y] == 0 or warehouse[x][y] == 'x' for y in range(cols)]
+            for x in range(rows)]
+    free[dropzone[0]][dropzone[1]] = True
+    boxes = {}
+    for x in range(rows):
+        for y in range(cols):
+            if not free[x][y]:
+                boxes[warehouse[x][y]] = [x, y]
+    value = [[float('inf') for y in range(cols)] for x in range(rows)]
+
+    def relax(open):
+        while open:
+            d, x, y = heapq.heappop(open)
+            if d > value[x][y]:
+                continue
+            for i in range(len(delta)):
+                x2 = x + delta[i][0]
+                y2 = y + delta[i][1]
+                if x2 >= 0 and x2 < rows and y2 >= 0 and y2 < cols and free[x2][y2]:
+                    if d + step[i] < value[x2][y2]:
+                        value[x2][y2] = d + step[i]
+                        heapq.heappush(open, (d + step[i], x2, y2))
+
+    def distance(x, y):
+        d = float('inf')
+        for i in range(len(delta)):
+            x2 = x - delta[i][0]
+            y2 = y - delta[i][1]
+            if x2 >= 0 and x2 < rows and y2 >= 0 and y2 < cols and free[x2][y2]:
+                d = min(d, value[x2][y2] + step[i])
+        return d
+
+    value[dropzone[0]][dropzone[1]] = 0
+    relax([(0, dropzone[0], dropzone[1])])
+
+    cost = 0
+    for box in todo:
+        x, y = boxes.pop(box)
+        value[x][y] = distance(x, y)
+        cost += 2 * value[x][y]
+        free[x][y] = True
+        relax([(value[x][y], x, y)])
     return cost
 
 
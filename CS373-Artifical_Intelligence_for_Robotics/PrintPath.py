@@ -96,4 +96,5 @@ def search(grid,init,goal,cost):
   
     return policy # make sure you return the shortest path
 
-search(grid,init,goal,cost)
+if __name__ == '__main__':
+    search(grid,init,goal,cost)
@@ -57,7 +57,9 @@
 # not) want to use.
 from robot import *
 from math import *
-from matrix import *
+import sys, os
+sys.path.append(os.pardir)
+from common.runaway import CircleEstimator
 import random
 
 
@@ -70,8 +72,14 @@ import random
 def estimate_next_pos(measurement, OTHER = None):
     """Estimate the next (x, y) position of the wandering Traxbot
     based on noisy (x, y) measurements."""
-    xy_estimate = measurement
-    OTHER = None
+    # OTHER is a CircleEstimator: three measurements give the step size
+    # and the turning angle, later ones refine them with an EKF. The same
+    # class filters many targets at once and predicts k steps ahead with
+    # OTHER.predict(k).
+    if OTHER is None:
+        OTHER = CircleEstimator()
+    x, y = OTHER.update([measurement])[0]
+    xy_estimate = (x, y)
     # You must return xy_estimate (x, y), and OTHER (even if it is None)
     # in this order for grading purposes.
     return xy_estimate, OTHER
@@ -163,6 +171,11 @@ def demo_grading(estimate_next_pos_fcn, target_bot, OTHER = None):
         #End of Visualization
     return localized
 
+# common/runaway_grading.py runs this grading for many seeded targets in
+# parallel (Python 3): run_trials(CircleEstimator, 1000, seed=1,
+# measurement_noise=0.075) returns the step each target was localized
+# at, and report() their distribution.
+
 # This is a demo for what a strategy could look like. This one isn't very good.
 def naive_next_pos(measurement, OTHER = None):
     """This strategy records the first reported position of the target and
@@ -173,9 +186,10 @@ def naive_next_pos(measurement, OTHER = None):
     xy_estimate = OTHER
     return xy_estimate, OTHER
 
-# This is how we create a target bot. Check the robot.py file to understand
-# How the robot class behaves.
-test_target = robot(2.1, 4.3, 0.5, 2*pi / 34.0, 1.5)
-test_target.set_noise(0.0, 0.0, 0.0)
+if __name__ == '__main__':
+    # This is how we create a target bot. Check the robot.py file to understand
+    # How the robot class behaves.
+    test_target = robot(2.1, 4.3, 0.5, 2*pi / 34.0, 1.5)
+    test_target.set_noise(0.0, 0.0, 0.0)
 
-demo_grading(naive_next_pos, test_target)
+    demo_grading(naive_next_pos, test_target)
@@ -88,22 +88,42 @@ cost_step = 1
 collision_cost = 1000
 success_prob = 0.5
 
-value, policy = stochastic_value(grid, goal, cost_step, collision_cost, success_prob)
-for row in value:
-    print(row)
-for row in policy:
-    print(row)
-
-# Expected outputs:
-#
-# [471.9397246855924, 274.85364957758316, 161.5599867065471, 0],
-# [334.05159958720344, 230.9574434590965, 183.69314862430264, 176.69517762501977],
-# [398.3517867450282, 277.5898270101976, 246.09263437756917, 335.3944132514738],
-# [700.1758933725141, 1000, 1000, 668.697206625737]
-
-
-#
-# ['>', 'v', 'v', '*']
-# ['>', '>', '^', '<']
-# ['>', '^', '^', '<']
-# ['^', ' ', ' ', '^']
+if __name__ == '__main__':
+    value, policy = stochastic_value(grid, goal, cost_step, collision_cost, success_prob)
+    for row in value:
+        print(row)
+    for row in policy:
+        print(row)
+
+    # Uncomment the following lines to run the same value iteration with the
+    # NumPy engine of common/value_iteration.py.
+    #
+    # from common.value_iteration import stochastic_value as fast_stochastic_value
+    # value, policy = fast_stochastic_value(grid, goal, cost_step, collision_cost, success_prob)
+    # for row in value.tolist():
+    #     print(row)
+    # for row in policy.tolist():
+    #     print(row)
+    #
+    # common/mdp.py solves it to a tolerance instead, with in-place
+    # (Gauss-Seidel) or prioritized sweeps, and reports the effort:
+    #
+    # from common.mdp import solve
+    # value, policy, iterations, residual = solve(grid, goal, cost_step, collision_cost,
+    #                                             success_prob, mode='gauss-seidel',
+    #                                             epsilon=0.001)
+    # print(iterations, residual)
+
+    # Expected outputs:
+    #
+    # [471.9397246855924, 274.85364957758316, 161.5599867065471, 0],
+    # [334.05159958720344, 230.9574434590965, 183.69314862430264, 176.69517762501977],
+    # [398.3517867450282, 277.5898270101976, 246.09263437756917, 335.3944132514738],
+    # [700.1758933725141, 1000, 1000, 668.697206625737]
+
+
+    #
+    # ['>', 'v', 'v', '*']
+    # ['>', '>', '^', '<']
+    # ['>', '^', '^', '<']
+    # ['^', ' ', ' ', '^']
@@ -57,6 +57,15 @@ def compute_value(grid, goal, cost):
     return value
 
 
-value = compute_value(grid, goal, cost)
-for i in range(len(value)):
-    print(value[i])
\ No newline at end of file
+if __name__ == '__main__':
+    value = compute_value(grid, goal, cost)
+    for i in range(len(value)):
+        print(value[i])
+
+    # Uncomment the following lines to compute the value grid with the NumPy
+    # engine of common/value_iteration.py (method='iterate' runs the same
+    # sweeps as above on whole arrays, 'dijkstra' needs one pass).
+    #
+    # from common.value_iteration import compute_value as fast_compute_value
+    # for row in fast_compute_value(grid, goal, cost).tolist():
+    #     print(row)
@@ -0,0 +1,49 @@
+import argparse
+import sys
+
+from benchmarks.cases import all_cases
+from benchmarks.harness import run_cases, write_report, read_report, compare
+
+
+# ------------------------------------------------
+#
+# python -m benchmarks [--quick] [--only search slam ...]
+#                      [--output benchmark.json] [--compare old.json]
+#
+# run from the CS373 directory, next to common/
+#
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--quick', action='store_true', help='small sizes only')
+    parser.add_argument('--only', nargs='+', metavar='CASE', help='cases to run')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--compare', metavar='REPORT', help='earlier report to compare with')
+    args = parser.parse_args(argv)
+
+    cases = all_cases(args.quick)
+    if args.only:
+        unknown = set(args.only) - set(c.name for c in cases)
+        if unknown:
+            parser.error('unknown case: ' + ', '.join(sorted(unknown)))
+        cases = [c for c in cases if c.name in args.only]
+
+    report = run_cases(cases, args.repeat, args.seed, log=print)
+    write_report(report, args.output)
+    for name, result in report['cases'].items():
+        print('%-16s time ~ %s^%s, memory ~ %s^%s' % (
+            name, result['unit'], _format(result['time_exponent']),
+            result['unit'], _format(result['memory_exponent'])))
+    if args.compare:
+        compare(read_report(args.compare), report)
+    return 0
+
+
+def _format(value):
+    return '-' if value is None else '%.2f' % value
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import random
+from math import *
+
+import numpy as np
+
+from benchmarks.harness import Case
+
+
+# ------------------------------------------------
+#
+# generated problems for the CS373 entry points
+#
+# Every setup(size, rng) builds its inputs from rng only and returns
+# the call to measure, so the construction is not timed:
+#
+#   search          A* of GridPlanner on a size x size grid
+#   compute_value   value_iteration.compute_value on the same grids
+#   particle_filter particle_filter() of car-ParticalFilter.py, size particles
+#   slam            sparse_slam() of Full_SLAM.py, size poses
+#   online_slam     incremental_online_slam() of Online_SLAM.py, size poses
+#   smooth          smoothing.smooth() of a size point second order path
+#   twiddle         tuning.Tuner on pid.twiddle_errors, runs of 2 size steps
+#
+# quick=True uses the smaller sizes only.
+#
+
+# --------
+#
+# random grid with about `density` obstacles; a random staircase of
+# free cells from the top left to the bottom right corner keeps the
+# goal reachable
+#
+
+def make_grid(size, rng, density=0.2):
+    grid = (rng.random((size, size)) < density).astype(int)
+    moves = rng.permutation(np.repeat([0, 1], size - 1))
+    rows = np.concatenate([[0], np.cumsum(moves == 0)])
+    cols = np.concatenate([[0], np.cumsum(moves == 1)])
+    grid[rows, cols] = 0
+    return grid
+
+
+def setup_search(size, rng):
+    from common.planning import GridPlanner
+    planner = GridPlanner(make_grid(size, rng))
+    assert planner.search([0, 0], [size - 1, size - 1]) != 'fail'
+    return lambda: planner.search([0, 0], [size - 1, size - 1])
+
+
+def setup_compute_value(size, rng):
+    from common.value_iteration import compute_value
+    grid = make_grid(size, rng)
+    return lambda: compute_value(grid, [size - 1, size - 1], 1)
+
+
+# --------
+#
+# the car of car-ParticalFilter.py driving 8 noise free steps among 4
+# landmarks; the filter is seeded from rng as well
+#
+
+def setup_particle_filter(size, rng):
+    from common.particle_filter import CarParticleFilter, particle_filter
+    landmarks = [[0.0, 100.0], [0.0, 0.0], [100.0, 0.0], [100.0, 100.0]]
+    car = CarParticleFilter(1, landmarks, steering_noise=0.0, distance_noise=0.0,
+                            seed=int(rng.integers(2 ** 31)))
+    car.set(*(rng.random(3) * [100.0, 100.0, 2.0 * pi]))
+    motions = [[2.0 * pi / 10, 20.0] for k in range(8)]
+    measurements = []
+    for motion in motions:
+        car.move(motion)
+        measurements.append(car.sense_bearings()[0].tolist())
+    seed = int(rng.integers(2 ** 31))
+    return lambda: particle_filter(motions, measurements, landmarks, size, seed=seed)
+
+
+# --------
+#
+# make_data() of the GraphSLAM exercises with one landmark per 10 poses
+#
+
+def slam_data(size, rng):
+    from common.slam import make_data
+    num_landmarks = max(size // 10, 1)
+    world_size = 100.0 * sqrt(num_landmarks / 5.0)
+    data, r = make_data(size, num_landmarks, world_size, 50.0, 2.0, 2.0, 20.0,
+                        random.Random(int(rng.integers(2 ** 31))))
+    return data, num_landmarks, world_size
+
+
+def setup_slam(size, rng):
+    from common.slam import sparse_slam
+    data, num_landmarks, world_size = slam_data(size, rng)
+    return lambda: sparse_slam(data, size, num_landmarks, 2.0, 2.0, world_size)
+
+
+def setup_online_slam(size, rng):
+    from common.slam import incremental_online_slam
+    data, num_landmarks, world_size = slam_data(size, rng)
+    return lambda: incremental_online_slam(data, size, num_landmarks, 2.0, 2.0, world_size)
+
+
+def setup_smooth(size, rng):
+    from common.smoothing import smooth
+    path = rng.normal(size=(size, 2)).cumsum(axis=0)
+    return lambda: smooth(path, 0.1, 0.2, second_order=True)
+
+
+# --------
+#
+# 10 rounds of the parallel twiddle, all runs of a round in one batch
+#
+
+def setup_twiddle(size, rng):
+    from common.pid import twiddle_errors
+    from common.tuning import Tuner
+
+    def cost(params, seeds):
+        return twiddle_errors(params, seeds, n=size)
+
+    def call():
+        with Tuner(cost, batch=True) as tuner:
+            return tuner.tune([0.0, 0.0, 0.0], max_rounds=10)
+    return call
+
+
+def all_cases(quick=False):
+    def sizes(small, large):
+        return small if quick else small + large
+    return [Case('search', sizes([32, 64, 128], [256, 512]), setup_search, 'side'),
+            Case('compute_value', sizes([32, 64, 128], [256, 512]), setup_compute_value,
+                 'side'),
+            Case('particle_filter', sizes([250, 1000, 4000], [16000, 64000]),
+                 setup_particle_filter),
+            Case('slam', sizes([50, 100, 200], [400, 800]), setup_slam),
+            Case('online_slam', sizes([50, 100, 200], [400, 800]), setup_online_slam),
+            Case('smooth', sizes([1000, 10000], [100000, 1000000]), setup_smooth),
+            Case('twiddle', sizes([25, 50, 100], [200, 400]), setup_twiddle)]
@@ -0,0 +1,144 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import zlib
+
+import numpy as np
+
+
+# ------------------------------------------------
+#
+# timing, memory and scaling of benchmark cases
+#
+# A case is a name, a list of problem sizes and setup(size, rng), which
+# builds the inputs and returns the call to measure. For every size
+#   time        - best wall time of `repeat` calls after a warm-up call,
+#                 in seconds
+#   peak_memory - peak of the memory traced by tracemalloc during one
+#                 more call, in bytes (NumPy buffers included)
+# and for the whole case the scaling exponents: the slopes of the least
+# squares lines through (log size, log time) and (log size, log memory),
+# so 1 is linear and 2 quadratic.
+#
+#   report = run_cases(cases, repeat=3, seed=0)
+#   write_report(report, 'benchmark.json')
+#   compare(read_report('old.json'), report)
+#
+
+class Case:
+
+    def __init__(self, name, sizes, setup, unit='n'):
+        self.name = name
+        self.sizes = list(sizes)
+        self.setup = setup
+        self.unit = unit
+
+
+def measure(call, repeat=3):
+    # one untimed call first, for imports and caches
+    call()
+    times = []
+    for k in range(repeat):
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        call()
+        peak = tracemalloc.get_traced_memory()[1] - base
+    finally:
+        tracemalloc.stop()
+    return min(times), max(peak, 0)
+
+
+def exponent(sizes, values):
+    sizes = np.asarray(sizes, dtype=float)
+    values = np.asarray(values, dtype=float)
+    keep = (sizes > 0) & (values > 0)
+    if keep.sum() < 2:
+        return None
+    return float(np.polyfit(np.log(sizes[keep]), np.log(values[keep]), 1)[0])
+
+
+# --------
+#
+# runs every case for all its sizes; rng is a numpy Generator seeded
+# from (seed, case name, size), so the inputs do not depend on which
+# cases run. `log` gets one line per measurement.
+#
+
+def run_cases(cases, repeat=3, seed=0, log=None):
+    results = {}
+    for case in cases:
+        times, peaks = [], []
+        for s in range(len(case.sizes)):
+            rng = np.random.default_rng([seed, zlib.crc32(case.name.encode()), case.sizes[s]])
+            call = case.setup(case.sizes[s], rng)
+            t, peak = measure(call, repeat)
+            times.append(t)
+            peaks.append(peak)
+            if log is not None:
+                log('%-16s %s=%-8d %10.4f s %12d B' % (case.name, case.unit, case.sizes[s],
+                                                      t, peak))
+        results[case.name] = dict(unit=case.unit,
+                                  sizes=case.sizes,
+                                  time=times,
+                                  peak_memory=peaks,
+                                  time_exponent=exponent(case.sizes, times),
+                                  memory_exponent=exponent(case.sizes, peaks))
+    return dict(environment=environment(), repeat=repeat, seed=seed, cases=results)
+
+
+def environment():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'],
+                                         stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return dict(created=time.strftime('%Y-%m-%dT%H:%M:%S'),
+                commit=commit,
+                python=platform.python_version(),
+                numpy=np.__version__,
+                machine=platform.machine(),
+                system=platform.system(),
+                cpus=os.cpu_count())
+
+
+# --------
+#
+# JSON reports and their comparison: for every case and size present in
+# both, the ratio new / old of time and peak memory
+#
+
+def write_report(report, filename):
+    with open(filename, 'w') as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def read_report(filename):
+    with open(filename) as f:
+        return json.load(f)
+
+
+def compare(old, new, out=sys.stdout):
+    rows = []
+    for name in sorted(set(old['cases']) & set(new['cases'])):
+        a, b = old['cases'][name], new['cases'][name]
+        sizes = dict(zip(a['sizes'], zip(a['time'], a['peak_memory'])))
+        for size, t, peak in zip(b['sizes'], b['time'], b['peak_memory']):
+            if size in sizes:
+                t0, peak0 = sizes[size]
+                rows.append((name, size, t / t0 if t0 else None,
+                             peak / float(peak0) if peak0 else None))
+    for name, size, t, peak in rows:
+        out.write('%-16s %-8d time x%s  memory x%s\n' % (
+            name, size, '%.2f' % t if t is not None else '-',
+            '%.2f' % peak if peak is not None else '-'))
+    return rows
@@ -352,24 +352,31 @@ measurements = [[4.746936, 3.859782, 3.045217, 2.045506],
                [0.194460, 5.660382, 4.761072, 2.471682],
                [5.717342, 4.736780, 3.909599, 2.342536]]
 
-print(particle_filter(motions, measurements))
-
-## 2) You can generate your own test cases by generating
-##    measurements using the generate_ground_truth function.
-##    It will print the robot's last location when calling it.
-##
-##
-##number_of_iterations = 6
-##motions = [[2. * pi / 20, 12.] for row in range(number_of_iterations)]
-##
-##x = generate_ground_truth(motions)
-##final_robot = x[0]
-##measurements = x[1]
-##estimated_position = particle_filter(motions, measurements)
-##print_measurements(measurements)
-##print 'Ground truth:    ', final_robot
-##print 'Particle filter: ', estimated_position
-##print 'Code check:      ', check_output(final_robot, estimated_position)
+if __name__ == '__main__':
+    print(particle_filter(motions, measurements))
+
+    ## The vectorized filter in common/particle_filter.py takes the same
+    ## motions and measurements and handles 100k particles:
+    ##
+    ##from common.particle_filter import particle_filter as vectorized_particle_filter
+    ##print(vectorized_particle_filter(motions, measurements, landmarks, N=100000))
+
+    ## 2) You can generate your own test cases by generating
+    ##    measurements using the generate_ground_truth function.
+    ##    It will print the robot's last location when calling it.
+    ##
+    ##
+    ##number_of_iterations = 6
+    ##motions = [[2. * pi / 20, 12.] for row in range(number_of_iterations)]
+    ##
+    ##x = generate_ground_truth(motions)
+    ##final_robot = x[0]
+    ##measurements = x[1]
+    ##estimated_position = particle_filter(motions, measurements)
+    ##print_measurements(measurements)
+    ##print 'Ground truth:    ', final_robot
+    ##print 'Particle filter: ', estimated_position
+    ##print 'Code check:      ', check_output(final_robot, estimated_position)
 
 
 
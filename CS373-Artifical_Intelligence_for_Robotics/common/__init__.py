@@ -0,0 +1,13 @@
+# ------------------------------------------------
+#
+# the CS373 algorithms as a library
+#
+#   from common.planning import GridPlanner
+#   from common.slam import sparse_slam
+#
+# Importing a module only defines it: nothing is printed, plotted or
+# run, and the cost is that of NumPy. SciPy is imported by the functions
+# that solve with it, on their first call. The lesson scripts around
+# this package run their demos under `if __name__ == '__main__':` only
+# and import matplotlib there.
+#
@@ -0,0 +1,158 @@
+import numpy as np
+
+
+# ------------------------------------------------
+#
+# histogram filter on cyclic worlds of any dimension
+#
+# The belief is a float array shaped like the world. Sensing multiplies
+# it by the likelihood of the measurement, looked up from a table made
+# once per colour. Moving convolves it cyclically with the motion
+# kernel: a kernel with few entries is applied as a sum of shifted
+# copies, a larger one (or a dense kernel array) as a product of FFTs,
+# with the transform of every kernel cached.
+#
+# sense() and move() update self.belief in place and return it, so a
+# returned belief changes with the next update: copy it to keep it.
+#
+# A kernel maps offsets to probabilities, e.g. the 2D exercise with
+# p_move = 0.8 and motion [0, 1]:
+#   {(0, 0): 0.2, (0, 1): 0.8}
+# and the 1D exercise with motion 2:
+#   {1: 0.1, 2: 0.8, 3: 0.1}
+#
+#   f = HistogramFilter(colors, p_hit=0.7, p_miss=0.3)
+#   f.move(move_kernel([0, 1], 0.8))
+#   f.sense('G')
+#   f.belief
+#
+
+class HistogramFilter:
+
+    # kernels with more entries than this are applied by FFT
+    fft_min_taps = 8
+
+    def __init__(self, world, p_hit, p_miss, verbose=False):
+        world = np.asarray(world)
+        self.shape = world.shape
+        self.belief = np.full(self.shape, 1.0 / world.size)
+        self.verbose = verbose
+
+        self.likelihood = {}
+        for color in np.unique(world):
+            self.likelihood[color] = np.where(world == color, p_hit, p_miss)
+        self.p_miss = p_miss
+        self._work = np.empty(self.shape)
+        self._fft_kernels = {}
+
+    # --------
+    #
+    # measurement update: likelihood lookup and normalization in place
+    #
+
+    def sense(self, Z):
+        likelihood = self.likelihood.get(Z)
+        if likelihood is None:
+            # a colour that is nowhere in the world: every cell missed
+            self.belief *= self.p_miss
+        else:
+            self.belief *= likelihood
+        total = self.belief.sum()
+        if total <= 0.0:
+            raise ValueError("Measurement has zero probability everywhere")
+        self.belief /= total
+        if self.verbose:
+            print("after sense: ", Z)
+            show(self.belief)
+        return self.belief
+
+    # --------
+    #
+    # motion update: cyclic convolution with the kernel (a dict of
+    # offset -> probability or a dense kernel array shaped like the world)
+    #
+
+    def move(self, kernel):
+        if isinstance(kernel, dict) and len(kernel) <= self.fft_min_taps:
+            out = self._work
+            out[...] = 0.0
+            for offset, probability in kernel.items():
+                add_shifted(out, self.belief, np.atleast_1d(offset), probability)
+            self.belief[...] = out
+        else:
+            K = self.kernel_transform(kernel)
+            self.belief[...] = np.fft.irfftn(np.fft.rfftn(self.belief) * K, s=self.shape)
+        if self.verbose:
+            print("after move: ", kernel)
+            show(self.belief)
+        return self.belief
+
+    def kernel_transform(self, kernel):
+        if isinstance(kernel, dict):
+            key = tuple(sorted(kernel.items()))
+            K = self._fft_kernels.get(key)
+            if K is None:
+                dense = np.zeros(self.shape)
+                for offset, probability in kernel.items():
+                    index = tuple(np.atleast_1d(offset) % self.shape)
+                    dense[index] += probability
+                K = self._fft_kernels[key] = np.fft.rfftn(dense)
+            return K
+        return np.fft.rfftn(np.asarray(kernel, dtype=float))
+
+
+# --------
+#
+# out += weight * np.roll(a, offset) over the leading axes, without the
+# rolled copy: every axis splits into the part that moves forward and
+# the part that wraps around, so this adds up to 2**len(offset) slices
+#
+
+def add_shifted(out, a, offset, weight):
+    pieces = [((), ())]
+    for shift, n in zip(offset, a.shape):
+        shift = int(shift) % n
+        parts = [(slice(shift, n), slice(0, n - shift))]
+        if shift:
+            parts.append((slice(0, shift), slice(n - shift, n)))
+        pieces = [(dst + (d,), src + (s,)) for dst, src in pieces for d, s in parts]
+    for dst, src in pieces:
+        out[dst] += weight * a[src]
+
+
+# --------
+#
+# kernels of the two exercises
+#
+
+def move_kernel(motion, p_move):
+    kernel = {(0,) * len(motion): 1.0 - p_move}
+    offset = tuple(motion)
+    kernel[offset] = kernel.get(offset, 0.0) + p_move
+    return kernel
+
+
+def step_kernel(U, p_exact, p_undershoot, p_overshoot):
+    return {U - 1: p_undershoot, U: p_exact, U + 1: p_overshoot}
+
+
+def show(p):
+    p = np.atleast_2d(p)
+    rows = ['[' + ','.join(map(lambda x: '{0:.5f}'.format(x), r)) + ']' for r in p]
+    print('[' + ',\n '.join(rows) + ']')
+
+
+# --------
+#
+# localize() of LocalizationProgram.py: uniform start, then move and
+# sense for every step
+#
+
+def localize(colors, measurements, motions, sensor_right, p_move, verbose=False):
+    if len(measurements) != len(motions):
+        raise ValueError("error in size of measurement/motion vector")
+    f = HistogramFilter(colors, sensor_right, 1.0 - sensor_right, verbose)
+    for k in range(len(measurements)):
+        f.move(move_kernel(motions[k], p_move))
+        f.sense(measurements[k])
+    return f.belief
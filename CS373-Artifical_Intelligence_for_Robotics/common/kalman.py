@@ -0,0 +1,199 @@
+import numpy as np
+
+
+# ------------------------------------------------
+#
+# Kalman filter over many tracks at once
+#
+# The M tracks share the model (F, u, H, R and the process noise Q) and
+# keep their states and covariances stacked as x (M, n) and P (M, n, n).
+# Prediction and update are single einsum / solve calls over all tracks;
+# the gain comes from solving with S instead of inverting it.
+#
+#   kf = BatchKalmanFilter(x, P, F, H, R)
+#   for Z in frames:              # Z is (M, m), one measurement per track
+#       kf.predict()
+#       kf.update(Z)
+#   kf.x, kf.P
+#
+# update(Z, mask) only touches the tracks whose mask entry is True, for
+# frames where some objects were not detected.
+#
+
+class BatchKalmanFilter:
+
+    def __init__(self, x, P, F, H, R, u=None, Q=None):
+        self.x = np.array(x, dtype=float)
+        self.M, self.n = self.x.shape
+        P = np.asarray(P, dtype=float)
+        self.P = np.array(np.broadcast_to(P, (self.M, self.n, self.n)))
+        self.F = np.asarray(F, dtype=float)
+        self.H = np.asarray(H, dtype=float)
+        self.R = np.asarray(R, dtype=float)
+        self.u = np.zeros(self.n) if u is None else np.asarray(u, dtype=float).reshape(-1)
+        self.Q = None if Q is None else np.asarray(Q, dtype=float)
+
+    # --------
+    #
+    # prediction: x = F x + u, P = F P F^T (+ Q) for every track
+    #
+
+    def predict(self):
+        self.x = self.x @ self.F.T + self.u
+        self.P = np.einsum('ij,mjk,lk->mil', self.F, self.P, self.F, optimize=True)
+        if self.Q is not None:
+            self.P += self.Q
+        return self.x
+
+    # --------
+    #
+    # measurement update with Z (M, m); the gain K = P H^T S^-1 is taken
+    # from solve(S, H P), S being symmetric
+    #
+
+    def update(self, Z, mask=None):
+        Z = np.asarray(Z, dtype=float)
+        if mask is None:
+            x, P = self.x, self.P
+        else:
+            mask = np.asarray(mask, dtype=bool)
+            x, P, Z = self.x[mask], self.P[mask], Z[mask]
+
+        H = self.H
+        y = Z - x @ H.T
+        HP = np.einsum('ij,mjk->mik', H, P)
+        S = np.einsum('mij,kj->mik', HP, H) + self.R
+        K = np.linalg.solve(S, HP).transpose(0, 2, 1)
+        x = x + np.einsum('mij,mj->mi', K, y)
+        P = P - np.einsum('mij,mjk->mik', K, HP)
+
+        if mask is None:
+            self.x, self.P = x, P
+        else:
+            self.x[mask] = x
+            self.P[mask] = P
+        return self.x
+
+    # --------
+    #
+    # filter() of KalmanFilter-4d.py for all tracks: measurements is
+    # (T, M, m), predict then update for every frame
+    #
+
+    def filter(self, measurements):
+        for Z in measurements:
+            self.predict()
+            self.update(Z)
+        return self.x, self.P
+
+
+# ------------------------------------------------
+#
+# single-track Kalman filter with preallocated workspaces
+#
+# All intermediate matrices live in buffers made once in __init__, and
+# every product is written into them with out=, so the update loop does
+# not allocate. The gain comes from a Cholesky solve of S (LAPACK posv,
+# in place) instead of an inverse, and the covariance uses the Joseph form
+#   P = (I - K H) P (I - K H)^T + K R K^T
+# which stays symmetric positive semi-definite under rounding.
+#
+#   kf = KalmanFilter(x, P, F, H, R, u)
+#   for z in measurements:
+#       kf.update(z)
+#       kf.predict()
+#   kf.x, kf.P
+#
+
+class KalmanFilter:
+
+    def __init__(self, x, P, F, H, R, u=None, Q=None):
+        self.x = np.array(x, dtype=float).reshape(-1)
+        n = len(self.x)
+        self.P = np.array(P, dtype=float).reshape(n, n)
+        self.F = np.asarray(F, dtype=float)
+        self.H = np.asarray(H, dtype=float)
+        m = self.H.shape[0]
+        self.R = np.asarray(R, dtype=float).reshape(m, m)
+        self.u = np.zeros(n) if u is None else np.array(u, dtype=float).reshape(-1)
+        self.Q = None if Q is None else np.asarray(Q, dtype=float)
+        self.I = np.eye(n)
+
+        # workspaces; S and HP are Fortran ordered for the in-place solve
+        self._x = np.empty(n)
+        self._y = np.empty(m)
+        self._S = np.empty((m, m), order='F')
+        self._HP = np.empty((m, n), order='F')
+        self._Kx = np.empty(n)
+        self._A = np.empty((n, n))
+        self._T = np.empty((n, n))
+        self._KR = np.empty((n, m))
+        # scipy.linalg.lapack.dposv, looked up on the first update
+        self._dposv = None
+
+    # --------
+    #
+    # prediction: x = F x + u, P = F P F^T (+ Q)
+    #
+
+    def predict(self):
+        np.matmul(self.F, self.x, out=self._x)
+        np.add(self._x, self.u, out=self.x)
+        np.matmul(self.F, self.P, out=self._T)
+        np.matmul(self._T, self.F.T, out=self.P)
+        if self.Q is not None:
+            self.P += self.Q
+        return self.x
+
+    # --------
+    #
+    # measurement update in Joseph form
+    #
+
+    def update(self, Z):
+        dposv = self._dposv
+        if dposv is None:
+            import scipy.linalg.lapack
+            dposv = self._dposv = scipy.linalg.lapack.dposv
+        x, P, H = self.x, self.P, self.H
+        y, S, HP, A, T = self._y, self._S, self._HP, self._A, self._T
+
+        np.matmul(H, x, out=y)
+        np.subtract(Z, y, out=y)
+        np.matmul(H, P, out=HP)
+        np.matmul(HP, H.T, out=S)
+        S += self.R
+
+        # S K^T = H P, solved in place: HP then holds K^T
+        c, Kt, info = dposv(S, HP, overwrite_a=1, overwrite_b=1)
+        if info != 0:
+            raise ValueError("Matrix not positive-definite")
+        K = Kt.T
+
+        np.matmul(K, y, out=self._Kx)
+        x += self._Kx
+
+        np.matmul(K, H, out=A)
+        np.subtract(self.I, A, out=A)
+        np.matmul(A, P, out=T)
+        np.matmul(T, A.T, out=P)
+        np.matmul(K, self.R, out=self._KR)
+        np.matmul(self._KR, Kt, out=T)
+        P += T
+        return x
+
+    # --------
+    #
+    # runs all measurements; predict_first=False is the order of
+    # kalmanFilter-2d.py (update, then predict)
+    #
+
+    def filter(self, measurements, predict_first=True):
+        for Z in measurements:
+            if predict_first:
+                self.predict()
+                self.update(Z)
+            else:
+                self.update(Z)
+                self.predict()
+        return self.x, self.P
@@ -0,0 +1,174 @@
+from math import *
+
+import numpy as np
+
+
+# ------------------------------------------------
+#
+# orientation-aware lattice planner
+#
+# The state of the car is (row, col, heading). With H headings the state
+# (x, y, o) gets the integer ID (x * cols + y) * H + o, so values and
+# policies are flat arrays over all states. An action turns the car by
+# action[i] headings (positive = left, as in LeftTurnPolicy.py) and then
+# moves one cell forward in the new heading, at cost[i] times the length
+# of the step.
+#
+# The transitions are built once per planner into a sparse graph. Dijkstra
+# over its reverse from the goal gives the cost-to-go of every state; one
+# pass over all states then picks the best action of each, and a path is
+# read off that policy.
+#
+#   planner = LatticePlanner(grid, cost=[2, 1, 20])
+#   planner.plan(goal)
+#   planner.policy2D(init)      # like optimum_policy2D()
+#
+# headings=8 adds the diagonals (action [-1, 0, 1] then turns by 45
+# degrees); any action list such as [-2, -1, 0, 1, 2] can be given.
+#
+
+forward4 = [[-1, 0],  # go up
+            [0, -1],  # go left
+            [1, 0],  # go down
+            [0, 1]]  # go right
+
+forward8 = [[-1, 0], [-1, -1], [0, -1], [1, -1],
+            [1, 0], [1, 1], [0, 1], [-1, 1]]
+
+
+class LatticePlanner:
+
+    def __init__(self, grid, cost=(2, 1, 20), action=(-1, 0, 1),
+                 action_name=('R', '#', 'L'), headings=4):
+        if headings == 4:
+            self.forward = forward4
+        elif headings == 8:
+            self.forward = forward8
+        else:
+            raise ValueError('headings must be 4 or 8')
+        if not (len(cost) == len(action) == len(action_name)):
+            raise ValueError('cost, action and action_name must have the same length')
+
+        self.grid = np.asarray(grid) != 0
+        self.rows, self.cols = self.grid.shape
+        self.headings = headings
+        self.cost = list(cost)
+        self.action = list(action)
+        self.action_name = list(action_name)
+        self.N = self.rows * self.cols * headings
+
+        self.successor = self.make_successors()
+        self.costs = self.step_cost()
+        self.graph = self.reverse_graph()
+        self.value = None
+        self.policy = None
+
+    def state(self, x, y, orientation):
+        return (x * self.cols + y) * self.headings + orientation
+
+    def unpack(self, s):
+        cell, orientation = divmod(int(s), self.headings)
+        x, y = divmod(cell, self.cols)
+        return [x, y, orientation]
+
+    # --------
+    #
+    # successor[s, i]: state reached from s with action i, -1 if the
+    # target cell is blocked or off the grid (or s itself is blocked).
+    # Diagonal moves also need both cells they pass between to be free,
+    # so paths do not cut the corners of obstacles.
+    #
+
+    def make_successors(self):
+        H = self.headings
+        x, y, o = np.meshgrid(np.arange(self.rows), np.arange(self.cols), np.arange(H),
+                              indexing='ij')
+        free = ~self.grid
+        dtype = np.int32 if self.N < 2 ** 31 else np.int64
+        successor = np.full((self.N, len(self.action)), -1, dtype=dtype)
+        forward = np.array(self.forward)
+        for i in range(len(self.action)):
+            o2 = (o + self.action[i]) % H
+            x2 = x + forward[o2, 0]
+            y2 = y + forward[o2, 1]
+            inside = (x2 >= 0) & (x2 < self.rows) & (y2 >= 0) & (y2 < self.cols)
+            x2c = np.clip(x2, 0, self.rows - 1)
+            y2c = np.clip(y2, 0, self.cols - 1)
+            # for straight moves these are the target and the start cell
+            valid = inside & free[x, y] & free[x2c, y2c] & free[x2c, y] & free[x, y2c]
+            s2 = (x2c * self.cols + y2c) * H + o2
+            successor[:, i] = np.where(valid, s2, -1).ravel()
+        return successor
+
+    # --------
+    #
+    # step_cost[s, i]: cost of action i in state s
+    #
+
+    def step_cost(self):
+        H = self.headings
+        o = np.arange(self.N) % H
+        length = np.hypot(*np.array(self.forward, dtype=float).T)
+        return np.array([self.cost[i] * length[(o + self.action[i]) % H]
+                         for i in range(len(self.action))]).T
+
+    # --------
+    #
+    # the transitions as a sparse graph with the edge successor -> state,
+    # so that distances from the goal are costs-to-go
+    #
+
+    def reverse_graph(self):
+        import scipy.sparse
+        s, i = np.nonzero(self.successor >= 0)
+        return scipy.sparse.csr_matrix((self.costs[s, i], (self.successor[s, i], s)),
+                                       shape=(self.N, self.N))
+
+    # --------
+    #
+    # cost-to-go of every state to the goal cell (any heading), by
+    # Dijkstra over the reversed transitions, and the policy: the index
+    # of the best action of every state, -1 where the goal cannot be
+    # reached, len(action) at the goal
+    #
+
+    def plan(self, goal):
+        import scipy.sparse.csgraph
+        goals = [self.state(goal[0], goal[1], o) for o in range(self.headings)]
+        self.value = scipy.sparse.csgraph.dijkstra(self.graph, indices=goals, min_only=True)
+        self.goal = goal
+
+        Q = np.where(self.successor >= 0,
+                     self.costs + self.value[np.maximum(self.successor, 0)], inf)
+        self.policy = np.where(np.isfinite(self.value), np.argmin(Q, axis=1), -1)
+        self.policy[goals] = len(self.action)
+        return self.value
+
+    # --------
+    #
+    # states from init to the goal following the policy
+    #
+
+    def path(self, init):
+        if self.policy is None:
+            raise ValueError('plan() must be called before path()')
+        s = self.state(*init)
+        if self.policy[s] < 0:
+            return []
+        path = [self.unpack(s)]
+        while self.policy[s] != len(self.action):
+            s = self.successor[s, self.policy[s]]
+            path.append(self.unpack(s))
+        return path
+
+    # --------
+    #
+    # the path of init drawn on the grid with action_name, '*' at the goal
+    #
+
+    def policy2D(self, init):
+        policy2D = [[' ' for col in range(self.cols)] for row in range(self.rows)]
+        for x, y, orientation in self.path(init):
+            a = self.policy[self.state(x, y, orientation)]
+            policy2D[x][y] = '*' if a == len(self.action) else self.action_name[a]
+        return policy2D
@@ -0,0 +1,239 @@
+import numpy as np
+
+
+# ------------------------------------------------
+#
+# this is the matrix class shared by the GraphSLAM and Kalman filter
+# exercises. It keeps the interface of the course's list-of-lists class
+# (zero, identity, take, expand, inverse, ...) but stores an ndarray in
+# self.value, so products and factorizations run in BLAS/LAPACK.
+#
+
+class matrix:
+
+    # implements basic operations of a matrix class
+
+    # ------------
+    #
+    # initialization - can be called with an initial matrix
+    #
+
+    def __init__(self, value=[[]]):
+        if len(value) == 0 or len(value[0]) == 0:
+            self.value = np.zeros((0, 0))
+        else:
+            self.value = np.asarray(value, dtype=float)
+
+    @property
+    def dimx(self):
+        return self.value.shape[0]
+
+    @property
+    def dimy(self):
+        return self.value.shape[1]
+
+    # ------------
+    #
+    # makes matrix of a certain size and sets each element to zero
+    #
+
+    def zero(self, dimx, dimy=0):
+        if dimy == 0:
+            dimy = dimx
+        # check if valid dimensions
+        if dimx < 1 or dimy < 1:
+            raise ValueError("Invalid size of matrix")
+        self.value = np.zeros((dimx, dimy))
+
+    # ------------
+    #
+    # makes matrix of a certain (square) size and turns matrix into identity matrix
+    #
+
+    def identity(self, dim):
+        # check if valid dimension
+        if dim < 1:
+            raise ValueError("Invalid size of matrix")
+        self.value = np.eye(dim)
+
+    # ------------
+    #
+    # prints out values of matrix as plain lists, as in the Kalman
+    # filter and RunawayRobot copies, or each formatted with fmt (the
+    # GraphSLAM copies pass fmt='%.3f')
+    #
+
+    def show(self, txt='', fmt=None):
+        for i in range(self.dimx):
+            if fmt is None:
+                print(txt + str(self.value[i].tolist()))
+            else:
+                print(txt + '[' + ', '.join(fmt % x for x in self.value[i]) + ']')
+        print(' ')
+
+    # -----------
+    #
+    # defines matrix equality - returns true if corresponding elements
+    #   in two matrices are within epsilon of each other.
+    #
+
+    def __eq__(self, other):
+        epsilon = 0.01
+        if self.dimx != other.dimx or self.dimy != other.dimy:
+            return False
+        return bool(np.all(np.abs(self.value - other.value) <= epsilon))
+
+    def __ne__(self, other):
+        return not (self == other)
+
+    # ------------
+    #
+    # defines elmement-wise matrix addition. Both matrices must be of equal dimensions
+    #
+
+    def __add__(self, other):
+        # check if correct dimensions
+        if self.dimx != other.dimx or self.dimy != other.dimy:
+            raise ValueError("Matrices must be of equal dimension to add")
+        return matrix(self.value + other.value)
+
+    # ------------
+    #
+    # defines elmement-wise matrix subtraction. Both matrices must be of equal dimensions
+    #
+
+    def __sub__(self, other):
+        # check if correct dimensions
+        if self.dimx != other.dimx or self.dimy != other.dimy:
+            raise ValueError("Matrices must be of equal dimension to subtract")
+        return matrix(self.value - other.value)
+
+    # ------------
+    #
+    # defines multiplication. Both matrices must be of fitting dimensions
+    #
+
+    def __mul__(self, other):
+        # check if correct dimensions
+        if self.dimy != other.dimx:
+            raise ValueError("Matrices must be m*n and n*p to multiply")
+        return matrix(np.dot(self.value, other.value))
+
+    # ------------
+    #
+    # returns a matrix transpose
+    #
+
+    def transpose(self):
+        return matrix(self.value.T.copy())
+
+    # ------------
+    #
+    # creates a new matrix from the existing matrix elements.
+    #
+    # Example:
+    #       l = matrix([[ 1,  2,  3,  4,  5],
+    #                   [ 6,  7,  8,  9, 10],
+    #                   [11, 12, 13, 14, 15]])
+    #
+    #       l.take([0, 2], [0, 2, 3])
+    #
+    # results in:
+    #
+    #       [[1, 3, 4],
+    #        [11, 13, 14]]
+    #
+    # take is used to remove rows and columns from existing matrices
+    # list1/list2 define a sequence of rows/columns that shall be taken
+    # if no list2 is provided, then list2 is set to list1 (good for
+    # symmetric matrices)
+    #
+
+    def take(self, list1, list2=[]):
+        list1 = list(list1)
+        list2 = list(list2)
+        if list2 == []:
+            list2 = list1
+        if len(list1) > self.dimx or len(list2) > self.dimy:
+            raise ValueError("list invalid in take()")
+        return matrix(self.value[np.ix_(list1, list2)])
+
+    # ------------
+    #
+    # creates a new matrix from the existing matrix elements.
+    #
+    # Example:
+    #       l = matrix([[1, 2, 3],
+    #                  [4, 5, 6]])
+    #
+    #       l.expand(3, 5, [0, 2], [0, 2, 3])
+    #
+    # results in:
+    #
+    #       [[1, 0, 2, 3, 0],
+    #        [0, 0, 0, 0, 0],
+    #        [4, 0, 5, 6, 0]]
+    #
+    # expand is used to introduce new rows and columns into an existing matrix
+    # list1/list2 are the new indexes of row/columns in which the matrix
+    # elements are being mapped. Elements for rows and columns
+    # that are not listed in list1/list2
+    # will be initialized by 0.0.
+    #
+
+    def expand(self, dimx, dimy, list1, list2=[]):
+        list1 = list(list1)
+        list2 = list(list2)
+        if list2 == []:
+            list2 = list1
+        if len(list1) > self.dimx or len(list2) > self.dimy:
+            raise ValueError("list invalid in expand()")
+
+        res = matrix()
+        res.zero(dimx, dimy)
+        res.value[np.ix_(list1, list2)] = self.value[:len(list1), :len(list2)]
+        return res
+
+    # ------------
+    #
+    # Computes the upper triangular Cholesky factorization of
+    # a positive definite matrix, i.e. the U with U^T U = self.
+    # LAPACK handles pivot tolerances, ztol is kept for compatibility.
+    #
+
+    def Cholesky(self, ztol=1.0e-5):
+        try:
+            L = np.linalg.cholesky(self.value)
+        except np.linalg.LinAlgError:
+            raise ValueError("Matrix not positive-definite")
+        return matrix(L.T.copy())
+
+    # ------------
+    #
+    # Computes inverse of matrix given its Cholesky upper Triangular
+    # decomposition of matrix.
+    #
+
+    def CholeskyInverse(self):
+        if np.any(np.diag(self.value) == 0.0):
+            raise ValueError("Zero diagonal")
+        Uinv = np.linalg.inv(self.value)
+        return matrix(np.dot(Uinv, Uinv.T))
+
+    # ------------
+    #
+    # computes and returns the inverse of a square matrix
+    #
+
+    def inverse(self):
+        aux = self.Cholesky()
+        res = aux.CholeskyInverse()
+        return res
+
+    # ------------
+    #
+    # prints matrix (needs work!)
+    #
+
+    def __repr__(self):
+        return repr(self.value.tolist())
@@ -0,0 +1,197 @@
+import heapq
+
+import numpy as np
+
+from common.value_iteration import pad, neighbours, delta4, best_backup, \
+    stochastic_backup, stochastic_lower_bound, stochastic_policy
+
+
+# ------------------------------------------------
+#
+# solvers for the stochastic grid MDP of StochasticMotion.py
+#
+# All modes start from init, by default the lower bound of
+# common/value_iteration.py, and stop once no backup changes a value by
+# more than epsilon (or after max_iter sweeps / backups):
+#
+#   'jacobi'       - synchronous sweeps on whole arrays
+#   'gauss-seidel' - in-place sweeps line by line, down, up, right and
+#                    left in turn, so new values travel across the map
+#                    within one sweep; each line is one array operation
+#   'prioritized'  - prioritized sweeping: single cell backups taken from
+#                    a heap ordered by Bellman residual, neighbours of a
+#                    changed cell are re-queued; pays off when only part
+#                    of the map is far from converged, e.g. when the
+#                    previous value is passed as init after a map edit
+#
+#   value, policy, iterations, residual = solve(grid, goal, cost_step,
+#                                               collision_cost, success_prob,
+#                                               mode='gauss-seidel')
+#
+# iterations counts sweeps (single backups for 'prioritized'); residual is
+# the largest Bellman residual |T(value) - value| of the returned value,
+# which bounds how far another sweep would move it.
+#
+
+def solve(grid, goal, cost_step, collision_cost, success_prob,
+          mode='gauss-seidel', epsilon=1e-6, max_iter=None, init=None):
+    grid = np.asarray(grid)
+    free = grid == 0
+    free[goal[0], goal[1]] = True
+
+    if init is None:
+        value = stochastic_lower_bound(grid, goal, cost_step, collision_cost)
+    else:
+        value = np.array(init, dtype=float)
+    value[goal[0], goal[1]] = 0.0
+    value[~free] = collision_cost
+    padded = pad(value, collision_cost)
+    fixed = pad(~free, True).astype(bool)
+    fixed[goal[0] + 1, goal[1] + 1] = True
+
+    if mode == 'jacobi':
+        iterations = jacobi(padded, fixed, cost_step, collision_cost, success_prob,
+                            epsilon, max_iter or 1000000)
+    elif mode == 'gauss-seidel':
+        iterations = gauss_seidel(padded, fixed, cost_step, collision_cost,
+                                  success_prob, epsilon, max_iter or 1000000)
+    elif mode == 'prioritized':
+        iterations = prioritized_sweeping(padded, fixed, cost_step, collision_cost,
+                                          success_prob, epsilon,
+                                          max_iter or 1000 * padded.size)
+    else:
+        raise ValueError("Unknown mode: " + str(mode))
+
+    value = padded[1:-1, 1:-1].copy()
+    residual = bellman_residual(padded, fixed, cost_step, collision_cost, success_prob)
+    policy = stochastic_policy(value, free, goal, cost_step, collision_cost, success_prob)
+    return value, policy, iterations, residual
+
+
+# --------
+#
+# largest |T(value) - value| over the cells that are not fixed
+#
+
+def bellman_residual(padded, fixed, cost_step, collision_cost, success_prob):
+    shape = (padded.shape[0] - 2, padded.shape[1] - 2)
+    out, vertical, horizontal = [np.empty(shape) for i in range(3)]
+    up, left, down, right = [neighbours(padded, dx, dy) for dx, dy in delta4]
+    best_backup(up, left, down, right, cost_step, collision_cost, success_prob,
+                out, vertical, horizontal)
+    out -= padded[1:-1, 1:-1]
+    out[fixed[1:-1, 1:-1]] = 0.0
+    return float(np.abs(out).max()) if out.size else 0.0
+
+
+# --------
+#
+# synchronous sweeps on the padded value array, in place
+#
+
+def jacobi(padded, fixed, cost_step, collision_cost, success_prob, epsilon, max_iter):
+    value = padded[1:-1, 1:-1]
+    keep = fixed[1:-1, 1:-1]
+    up, left, down, right = [neighbours(padded, dx, dy) for dx, dy in delta4]
+    best, vertical, horizontal = [np.empty(value.shape) for i in range(3)]
+
+    for iteration in range(1, max_iter + 1):
+        best_backup(up, left, down, right, cost_step, collision_cost, success_prob,
+                    best, vertical, horizontal)
+        np.copyto(best, value, where=keep)
+        np.subtract(best, value, out=vertical)
+        change = np.abs(vertical).max()
+        value[...] = best
+        if change <= epsilon:
+            break
+    return iteration
+
+
+# --------
+#
+# in-place sweeps over the lines of the padded array (rows of padded.T
+# are its columns); every line sees the lines updated before it
+#
+
+def gauss_seidel(padded, fixed, cost_step, collision_cost, success_prob,
+                 epsilon, max_iter):
+    def sweep(P, F, lines):
+        cols = P.shape[1]
+        best, vertical, horizontal = [np.empty(cols - 2) for i in range(3)]
+        change = 0.0
+        for r in lines:
+            value = P[r, 1:-1]
+            best_backup(P[r - 1, 1:-1], P[r, :-2], P[r + 1, 1:-1], P[r, 2:],
+                        cost_step, collision_cost, success_prob,
+                        best, vertical, horizontal)
+            np.copyto(best, value, where=F[r, 1:-1])
+            np.subtract(best, value, out=vertical)
+            change = max(change, np.abs(vertical).max())
+            value[...] = best
+        return change
+
+    rows, cols = padded.shape
+    for iteration in range(1, max_iter + 1):
+        change = sweep(padded, fixed, range(1, rows - 1))
+        change = max(change, sweep(padded, fixed, range(rows - 2, 0, -1)))
+        change = max(change, sweep(padded.T, fixed.T, range(1, cols - 1)))
+        change = max(change, sweep(padded.T, fixed.T, range(cols - 2, 0, -1)))
+        if change <= epsilon:
+            break
+    return iteration
+
+
+# --------
+#
+# prioritized sweeping on the flat padded array. The priority of a cell
+# is an upper bound of its Bellman residual: its initial residual plus,
+# for every later change of a neighbour, the change times the largest
+# transition probability. The heap holds (-priority, cell); entries
+# whose priority has since grown or been cleared are skipped.
+#
+
+def prioritized_sweeping(padded, fixed, cost_step, collision_cost, success_prob,
+                         epsilon, max_iter):
+    W = padded.shape[1]
+    V = padded.ravel().tolist()
+    movable = (~fixed).ravel().tolist()
+    p = success_prob
+    f = (1.0 - success_prob) / 2.0
+    weight = max(p, f)
+
+    # residuals of all cells from one array sweep
+    shape = (padded.shape[0] - 2, W - 2)
+    best, vertical, horizontal = [np.empty(shape) for i in range(3)]
+    up, left, down, right = [neighbours(padded, dx, dy) for dx, dy in delta4]
+    best_backup(up, left, down, right, cost_step, collision_cost, success_prob,
+                best, vertical, horizontal)
+    residual = np.zeros(padded.shape)
+    residual[1:-1, 1:-1] = np.abs(best - padded[1:-1, 1:-1])
+    residual[fixed] = 0.0
+    priority = residual.ravel().tolist()
+    cells = np.nonzero(residual.ravel() > epsilon)[0]
+    open = list(zip((-residual.ravel()[cells]).tolist(), cells.tolist()))
+    heapq.heapify(open)
+
+    backups = 0
+    while open and backups < max_iter:
+        bound, i = heapq.heappop(open)
+        if -bound != priority[i]:
+            continue
+        priority[i] = 0.0
+
+        u, d, l, r = V[i - W], V[i + W], V[i - 1], V[i + 1]
+        v = cost_step + min(p * min(u, d) + f * (l + r), p * min(l, r) + f * (u + d))
+        if v > collision_cost:
+            v = collision_cost
+        change = abs(v - V[i]) * weight
+        V[i] = v
+        backups += 1
+        for j in (i - W, i + W, i - 1, i + 1):
+            if movable[j]:
+                priority[j] += change
+                if priority[j] > epsilon:
+                    heapq.heappush(open, (-priority[j], j))
+
+    padded.ravel()[:] = V
+    return backups
@@ -0,0 +1,379 @@
+from abc import ABC, abstractmethod
+from math import *
+from statistics import NormalDist
+
+import numpy as np
+
+
+# ------------------------------------------------
+#
+# structure-of-arrays particle filters
+#
+# Instead of one robot object per particle the filters keep x, y,
+# orientation and the log-weights as arrays of length N, and apply the
+# motion model and the likelihood to all particles at once.
+#
+# ParticleFilter is the core: it accumulates log-weights (products of
+# many Gaussians underflow to 0, sums of their logs do not) and only
+# resamples when the effective sample size N_eff = 1 / sum(w^2) drops
+# below ess_threshold * N. With adaptive=True the resampling step also
+# picks the number of particles by KLD-sampling (Fox 2003): particles
+# are drawn until they are enough to bound the KL divergence between
+# the sample and the true posterior by epsilon with probability
+# 1 - delta, counting occupied (x, y, orientation) bins of size bin_size.
+#
+# The models of the exercises are subclasses:
+#
+#   CarParticleFilter      - car-ParticalFilter.py, bicycle model and
+#                            bearings to landmarks
+#   RangeParticleFilter    - ParticleFilter.py, cyclic world and
+#                            distances to landmarks
+#   PositionParticleFilter - particles in GraphSLAM/SegmentedCTE.py,
+#                            bicycle model and noisy (x, y) fixes
+#
+
+class ParticleFilter(ABC):
+
+    def __init__(self, N, seed=None, ess_threshold=0.5, adaptive=False,
+                 epsilon=0.05, delta=0.01, bin_size=(1.0, 1.0, pi / 18.0),
+                 min_particles=50, max_particles=None):
+        self.N = N
+        self.rng = np.random.default_rng(seed)
+        self.ess_threshold = ess_threshold
+        self.adaptive = adaptive
+        self.epsilon = epsilon
+        self.z = NormalDist().inv_cdf(1.0 - delta)
+        self.bin_size = np.asarray(bin_size, dtype=float)
+        self.min_particles = min_particles
+        self.max_particles = max_particles if max_particles is not None else N
+
+        self.x = np.zeros(N)
+        self.y = np.zeros(N)
+        self.orientation = np.zeros(N)
+        self.log_weights = np.zeros(N)
+        self.resampled = 0
+
+    # --------
+    #
+    # places all particles uniformly in a square world
+    #
+
+    def scatter(self, world_size):
+        self.x = self.rng.random(self.N) * world_size
+        self.y = self.rng.random(self.N) * world_size
+        self.orientation = self.rng.random(self.N) * 2.0 * pi
+        self.log_weights = np.zeros(self.N)
+
+    # --------
+    #
+    # places all particles at one pose
+    #
+
+    def set(self, x, y, orientation):
+        self.x = np.full(self.N, float(x))
+        self.y = np.full(self.N, float(y))
+        self.orientation = np.full(self.N, float(orientation) % (2.0 * pi))
+        self.log_weights = np.zeros(self.N)
+
+    # --------
+    #
+    # model interface, implemented by the subclasses
+    #
+
+    @abstractmethod
+    def move(self, motion):
+        pass
+
+    @abstractmethod
+    def log_likelihood(self, measurement):
+        pass
+
+    # --------
+    #
+    # normalized weights
+    #
+
+    @property
+    def weights(self):
+        w = np.exp(self.log_weights - self.log_weights.max())
+        return w / w.sum()
+
+    def effective_sample_size(self):
+        return 1.0 / np.sum(self.weights ** 2)
+
+    # --------
+    #
+    # measurement update: accumulates the log-likelihood and resamples
+    # only when the weights have degenerated
+    #
+
+    def sense(self, measurement, method='systematic'):
+        self.log_weights = self.log_weights + self.log_likelihood(measurement)
+        if not np.isfinite(self.log_weights.max()):
+            # every particle is impossible, start over with equal weights
+            self.log_weights = np.zeros(self.N)
+        if self.effective_sample_size() < self.ess_threshold * self.N:
+            self.resample(method)
+
+    def update(self, motion, measurement, method='systematic'):
+        self.move(motion)
+        self.sense(measurement, method)
+
+    # --------
+    #
+    # draws a new equally weighted particle set
+    #
+
+    def resample(self, method='systematic'):
+        w = self.weights
+        if self.adaptive:
+            index = self.kld_resample(w)
+        elif method == 'systematic':
+            index = systematic_resample(w, self.rng)
+        elif method == 'stratified':
+            index = stratified_resample(w, self.rng)
+        else:
+            raise ValueError('Unknown resampling method: ' + str(method))
+        self.x = self.x[index]
+        self.y = self.y[index]
+        self.orientation = self.orientation[index]
+        self.N = len(index)
+        self.log_weights = np.zeros(self.N)
+        self.resampled += 1
+
+    # --------
+    #
+    # KLD-sampling: draws i.i.d. candidates and keeps the shortest prefix
+    # whose size n satisfies n >= n_chi(k(n)), where k(n) is the number
+    # of bins the first n candidates occupy
+    #
+
+    def kld_resample(self, w):
+        index = multinomial_resample(w, self.rng, self.max_particles)
+        bins = np.floor(np.stack([self.x[index], self.y[index],
+                                  self.orientation[index]], axis=1) / self.bin_size)
+        first = np.unique(bins.astype(np.int64), axis=0, return_index=True)[1]
+        occupied = np.zeros(len(index), dtype=np.int64)
+        occupied[first] = 1
+        k = np.cumsum(occupied)
+        needed = self.kld_bound(k)
+        n = np.arange(1, len(index) + 1)
+        enough = np.flatnonzero((n >= needed) & (n >= self.min_particles))
+        size = enough[0] + 1 if len(enough) else len(index)
+        return index[:size]
+
+    def kld_bound(self, k):
+        k = np.maximum(np.asarray(k, dtype=float) - 1.0, 1.0)
+        a = 2.0 / (9.0 * k)
+        return np.ceil(k / (2.0 * self.epsilon) * (1.0 - a + np.sqrt(a) * self.z) ** 3)
+
+    # --------
+    #
+    # weighted mean of the particles. Orientation is cyclic, so it is
+    # normalized around the first particle as in the exercises.
+    #
+
+    def get_position(self):
+        w = self.weights
+        o0 = self.orientation[0]
+        orientation = ((self.orientation - o0 + pi) % (2.0 * pi)) + o0 - pi
+        return [float(np.dot(w, self.x)), float(np.dot(w, self.y)),
+                float(np.dot(w, orientation))]
+
+
+# --------
+#
+# bicycle model of the car exercises for arrays of poses
+#
+
+def bicycle_move(x, y, orientation, steering, distance, length, tolerance=0.001):
+    turn = np.tan(steering) * distance / length
+    straight = np.abs(turn) < tolerance
+    new_orientation = (orientation + turn) % (2.0 * pi)
+
+    # approximate bicycle model for motion, straight line where the
+    # turn is negligible
+    radius = distance / np.where(straight, 1.0, turn)
+    new_x = np.where(straight,
+                     x + distance * np.cos(orientation),
+                     x - np.sin(orientation) * radius + np.sin(new_orientation) * radius)
+    new_y = np.where(straight,
+                     y + distance * np.sin(orientation),
+                     y + np.cos(orientation) * radius - np.cos(new_orientation) * radius)
+    return new_x, new_y, new_orientation
+
+
+# --------
+#
+# log of the 1-dim Gaussian with standard deviation sigma
+#
+
+def log_gaussian(error, sigma):
+    return -error ** 2 / (sigma ** 2) / 2.0 - 0.5 * log(2.0 * pi * (sigma ** 2))
+
+
+# ------------------------------------------------
+#
+# car-ParticalFilter.py: bearings to landmarks given in (y, x) form
+#
+
+class CarParticleFilter(ParticleFilter):
+
+    def __init__(self, N, landmarks, length=20.0, bearing_noise=0.1,
+                 steering_noise=0.1, distance_noise=5.0, world_size=100.0,
+                 max_steering_angle=pi / 4.0, **kwargs):
+        ParticleFilter.__init__(self, N, **kwargs)
+        self.landmarks = np.asarray(landmarks, dtype=float)
+        self.length = length
+        self.bearing_noise = bearing_noise
+        self.steering_noise = steering_noise
+        self.distance_noise = distance_noise
+        self.max_steering_angle = max_steering_angle
+        self.scatter(world_size)
+
+    def move(self, motion):
+        steering, distance = motion
+        if abs(steering) > self.max_steering_angle:
+            raise ValueError('Exceeding max steering angle')
+        if distance < 0.0:
+            raise ValueError('Moving backwards is not valid')
+
+        steering2 = self.rng.normal(steering, self.steering_noise, self.N)
+        distance2 = self.rng.normal(distance, self.distance_noise, self.N)
+        self.x, self.y, self.orientation = bicycle_move(
+            self.x, self.y, self.orientation, steering2, distance2, self.length)
+
+    # noise free bearings to all landmarks, one row per particle
+    def sense_bearings(self):
+        bearing = np.arctan2(self.landmarks[:, 0] - self.y[:, None],
+                             self.landmarks[:, 1] - self.x[:, None]) - self.orientation[:, None]
+        return bearing % (2.0 * pi)
+
+    def log_likelihood(self, measurement):
+        error = np.asarray(measurement, dtype=float) - self.sense_bearings()
+        error = (error + pi) % (2.0 * pi) - pi
+        return log_gaussian(error, self.bearing_noise).sum(axis=1)
+
+
+# ------------------------------------------------
+#
+# ParticleFilter.py: distances to landmarks in a cyclic world
+#
+
+class RangeParticleFilter(ParticleFilter):
+
+    def __init__(self, N, landmarks, forward_noise=0.05, turn_noise=0.05,
+                 sense_noise=5.0, world_size=100.0, **kwargs):
+        ParticleFilter.__init__(self, N, **kwargs)
+        self.landmarks = np.asarray(landmarks, dtype=float)
+        self.forward_noise = forward_noise
+        self.turn_noise = turn_noise
+        self.sense_noise = sense_noise
+        self.world_size = world_size
+        self.scatter(world_size)
+
+    def move(self, motion):
+        turn, forward = motion
+        if forward < 0:
+            raise ValueError('Robot cant move backwards')
+
+        # turn, and add randomness to the turning command
+        self.orientation = (self.orientation + float(turn)
+                            + self.rng.normal(0.0, self.turn_noise, self.N)) % (2.0 * pi)
+
+        # move, and add randomness to the motion command
+        dist = float(forward) + self.rng.normal(0.0, self.forward_noise, self.N)
+        self.x = (self.x + np.cos(self.orientation) * dist) % self.world_size
+        self.y = (self.y + np.sin(self.orientation) * dist) % self.world_size
+
+    def log_likelihood(self, measurement):
+        dist = np.hypot(self.x[:, None] - self.landmarks[:, 0],
+                        self.y[:, None] - self.landmarks[:, 1])
+        error = np.asarray(measurement, dtype=float) - dist
+        return log_gaussian(error, self.sense_noise).sum(axis=1)
+
+
+# ------------------------------------------------
+#
+# GraphSLAM/SegmentedCTE.py: the car senses a noisy (x, y) of itself
+#
+
+class PositionParticleFilter(ParticleFilter):
+
+    def __init__(self, N, x, y, theta, steering_noise, distance_noise,
+                 measurement_noise, length=0.5, max_steering_angle=pi / 4.0, **kwargs):
+        ParticleFilter.__init__(self, N, **kwargs)
+        self.steering_noise = steering_noise
+        self.distance_noise = distance_noise
+        self.measurement_noise = measurement_noise
+        self.length = length
+        self.max_steering_angle = max_steering_angle
+        self.set(x, y, theta)
+
+    def move(self, motion):
+        steering, distance = motion
+        steering = max(-self.max_steering_angle, min(self.max_steering_angle, steering))
+        distance = max(0.0, distance)
+
+        steering2 = self.rng.normal(steering, self.steering_noise, self.N)
+        distance2 = self.rng.normal(distance, self.distance_noise, self.N)
+        self.x, self.y, self.orientation = bicycle_move(
+            self.x, self.y, self.orientation, steering2, distance2, self.length)
+
+    def log_likelihood(self, measurement):
+        return (log_gaussian(measurement[0] - self.x, self.measurement_noise)
+                + log_gaussian(measurement[1] - self.y, self.measurement_noise))
+
+
+# --------
+#
+# systematic (low variance) resampling: one random offset, N evenly
+# spaced pointers into the cumulative weights. O(N log N), no loops.
+#
+
+def systematic_resample(weights, rng, N=None):
+    N = len(weights) if N is None else N
+    positions = (rng.random() + np.arange(N)) / N
+    return _search(weights, positions)
+
+
+# --------
+#
+# stratified resampling: one random pointer in each of the N strata
+#
+
+def stratified_resample(weights, rng, N=None):
+    N = len(weights) if N is None else N
+    positions = (rng.random(N) + np.arange(N)) / N
+    return _search(weights, positions)
+
+
+# --------
+#
+# multinomial resampling: N independent draws, in random order
+#
+
+def multinomial_resample(weights, rng, N=None):
+    N = len(weights) if N is None else N
+    return _search(weights, rng.random(N))
+
+
+def _search(weights, positions):
+    cumulative = np.cumsum(weights)
+    cumulative /= cumulative[-1]
+    index = np.searchsorted(cumulative, positions, side='right')
+    return np.minimum(index, len(weights) - 1)
+
+
+# --------
+#
+# particle_filter - same inputs and output as particle_filter() in
+# car-ParticalFilter.py
+#
+
+def particle_filter(motions, measurements, landmarks, N=500, method='systematic',
+                    **kwargs):
+    pf = CarParticleFilter(N, landmarks, **kwargs)
+    for t in range(len(motions)):
+        pf.update(motions[t], measurements[t], method)
+    return pf.get_position()
@@ -0,0 +1,149 @@
+from math import *
+
+import numpy as np
+
+
+# ------------------------------------------------
+#
+# cross track error against a polyline, for many points at once
+#
+# PathIndex keeps the segments of a path (start, direction, length,
+# arc length at the start) and a KD-tree over the midpoints of short
+# pieces of them, built once. project() finds the nearest segment of
+# every query point and returns
+#   cte   - signed distance, positive to the left of the path direction
+#           (the sign of cte() in SegmentedCTE.py and Racetrack_Control.py)
+#   s     - arc length of the nearest point of the path
+#   index - the segment it lies on
+#
+# The nearest segment comes from the k nearest pieces. A piece at
+# distance r from its midpoint is at least r - h / 2 away, h being the
+# longest piece, so the answer is exact whenever it is closer than the
+# k-th midpoint minus h / 2. Points where that does not hold (near a
+# centre of curvature) are asked again with 8 times as many pieces,
+# until all pieces have been checked.
+#
+#   track = PathIndex(spath)
+#   cte, s, index = track.project(points)          # (M, 2) points
+#   cte, s, index = track.locate(estimate, index)  # one point, near index
+#
+
+class PathIndex:
+
+    def __init__(self, path, cyclic=False, piece=None, k=8):
+        from scipy.spatial import cKDTree
+        points = np.asarray(path, dtype=float)[:, :2]
+        if cyclic:
+            points = np.vstack([points, points[:1]])
+        if len(points) < 2:
+            raise ValueError("A path needs at least two points")
+        self.cyclic = cyclic
+        self.start = points[:-1]
+        self.vector = np.diff(points, axis=0)
+        self.length = np.hypot(self.vector[:, 0], self.vector[:, 1])
+        self.arc = np.concatenate([[0.0], np.cumsum(self.length)])
+        self.total = self.arc[-1]
+        # zero length segments project onto their start
+        self._inverse_length2 = np.divide(1.0, self.length ** 2, out=np.zeros(len(self.length)),
+                                          where=self.length > 0.0)
+
+        # cut segments into pieces no longer than `piece` for the tree
+        if piece is None:
+            piece = max(np.median(self.length), 1e-9)
+        cuts = np.maximum(np.ceil(self.length / piece), 1).astype(int)
+        owner = np.repeat(np.arange(len(cuts)), cuts)
+        first = np.repeat(np.cumsum(cuts) - cuts, cuts)
+        t = (np.arange(len(owner)) - first + 0.5) / cuts[owner]
+        self._owner = owner
+        self._half = 0.5 * (self.length / cuts).max()
+        self._tree = cKDTree(self.start[owner] + t[:, None] * self.vector[owner])
+        self.k = min(k, len(owner))
+
+    # --------
+    #
+    # distance, cte and arc length of points q (M, 2) to the segments
+    # seg (M,) or (M, c)
+    #
+
+    def distance(self, q, seg):
+        q = q.reshape(q.shape[:1] + (1,) * (seg.ndim - 1) + (2,))
+        d = self.vector[seg]
+        r = q - self.start[seg]
+        u = (r[..., 0] * d[..., 0] + r[..., 1] * d[..., 1]) * self._inverse_length2[seg]
+        t = np.clip(u, 0.0, 1.0)
+        e = r - t[..., None] * d
+        dist = np.hypot(e[..., 0], e[..., 1])
+        cross = d[..., 0] * r[..., 1] - d[..., 1] * r[..., 0]
+        cte = np.where(cross < 0.0, -dist, dist)
+        return dist, cte, self.arc[seg] + t * self.length[seg]
+
+    def project(self, points):
+        q = np.atleast_2d(np.asarray(points, dtype=float))[:, :2]
+        cte = np.empty(len(q))
+        s = np.empty(len(q))
+        index = np.empty(len(q), dtype=int)
+
+        # points whose nearest segment may not be among the k candidates
+        # are asked again with 8 times as many, and at last against all
+        rows = np.arange(len(q))
+        k = self.k
+        while len(rows):
+            if k < len(self._owner):
+                r, j = self._tree.query(q[rows], k)
+                candidates = self._owner[j]
+            else:
+                candidates = np.broadcast_to(np.arange(len(self.length)),
+                                             (len(rows), len(self.length)))
+            dist, c, a = self.distance(q[rows], candidates)
+            best = dist.argmin(axis=1)
+            picked = np.arange(len(rows))
+            index[rows] = candidates[picked, best]
+            cte[rows] = c[picked, best]
+            s[rows] = a[picked, best]
+            if k >= len(self._owner):
+                break
+            rows = rows[dist[picked, best] > r[:, -1] - self._half]
+            k *= 8
+        return cte, s, index
+
+    # --------
+    #
+    # one point, searching the `window` segments from index on (wrapping
+    # on cyclic paths) as the run() loop of SegmentedCTE.py does; falls
+    # back to project() when index is None or the point is closer to the
+    # end of the window than to anything in it
+    #
+
+    def locate(self, point, index=None, window=8):
+        if index is None:
+            cte, s, index = self.project([point])
+            return cte[0], s[0], int(index[0])
+        n = len(self.length)
+        seg = np.arange(index, index + window)
+        seg = seg % n if self.cyclic else seg[seg < n]
+        q = np.asarray(point, dtype=float)[None, :2]
+        dist, cte, s = self.distance(q, seg[None])
+        best = int(dist[0].argmin())
+        if best == len(seg) - 1 and len(seg) == window:
+            return self.locate(point, None)
+        return cte[0, best], s[0, best], int(seg[best])
+
+
+# --------
+#
+# the racetrack of Racetrack_Control.py as a cyclic polyline: two half
+# circles of the given radius around (radius, radius) and
+# (3 radius, radius), joined by straight lines at y = 0 and y = 2 radius,
+# driven clockwise from (0, radius)
+#
+
+def racetrack(radius, points_per_arc=256):
+    m = points_per_arc // 2
+    quarter = np.linspace(pi, 0.5 * pi, m + 1)
+    half = np.linspace(0.5 * pi, -0.5 * pi, 2 * m + 1)
+    centers = [(radius, radius), (3.0 * radius, radius), (radius, radius)]
+    angles = [quarter, half, quarter - 1.5 * pi]
+    arcs = [np.c_[cx + radius * np.cos(a), cy + radius * np.sin(a)]
+            for (cx, cy), a in zip(centers, angles)]
+    # the last point closes the loop on the first one
+    return np.vstack(arcs)[:-1]
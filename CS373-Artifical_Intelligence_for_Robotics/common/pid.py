@@ -0,0 +1,150 @@
+import numpy as np
+
+
+# ------------------------------------------------
+#
+# batch simulator for the PID_Control robot
+#
+# BatchRobot is the Robot class of PID_Control/*.py (a bicycle model
+# with steering noise, distance noise and steering drift) for K robots
+# at once: every attribute is a (K,) array, and one move() advances all
+# of them. Lengths, noise and drift may differ per robot.
+#
+# run() is the PID loop of PID_Controller.py / twiddle.py for all robots
+# in lockstep, with one row of gains [tau_p, tau_d, tau_i] per robot
+# (the P and PD controllers are the rows with zeros). It writes into
+# (K, T) buffers that can be reused between calls:
+#
+#   robots = make_robots(3, drift=10.0 / 180.0 * np.pi)
+#   x, y, cte = run(robots, [[0.2, 3.0, 0.004],
+#                            [0.2, 3.0, 0.0],
+#                            [0.1, 0.0, 0.0]], 100)
+#
+# With seeds, robot k draws its noise from its own generator, so its
+# run does not depend on the other robots in the batch.
+#
+
+class BatchRobot:
+
+    def __init__(self, K, length=20.0):
+        self.K = K
+        self.x = np.zeros(K)
+        self.y = np.zeros(K)
+        self.orientation = np.zeros(K)
+        self.length = np.broadcast_to(np.asarray(length, dtype=float), K).copy()
+        self.steering_noise = np.zeros(K)
+        self.distance_noise = np.zeros(K)
+        self.steering_drift = np.zeros(K)
+
+    def set(self, x, y, orientation):
+        self.x[:] = x
+        self.y[:] = y
+        self.orientation[:] = np.mod(orientation, 2.0 * np.pi)
+
+    def set_noise(self, steering_noise, distance_noise):
+        self.steering_noise[:] = steering_noise
+        self.distance_noise[:] = distance_noise
+
+    def set_steering_drift(self, drift):
+        self.steering_drift[:] = drift
+
+    # --------
+    #
+    # steering and distance are scalars or (K,); noise is a pair of
+    # (K,) standard normal draws for steering and distance, or None for
+    # noise free motion
+    #
+
+    def move(self, steering, distance, noise=None, tolerance=0.001,
+             max_steering_angle=np.pi / 4.0):
+        steering = np.clip(steering, -max_steering_angle, max_steering_angle)
+        distance = np.maximum(distance, 0.0)
+
+        # apply noise and steering drift
+        steering2 = steering + self.steering_drift
+        distance2 = distance
+        if noise is not None:
+            steering2 = steering2 + self.steering_noise * noise[0]
+            distance2 = distance2 + self.distance_noise * noise[1]
+
+        # Execute motion, straight lines where the turn is below tolerance
+        turn = np.tan(steering2) * distance2 / self.length
+        straight = np.abs(turn) < tolerance
+        radius = distance2 / np.where(straight, 1.0, turn)
+
+        sin0, cos0 = np.sin(self.orientation), np.cos(self.orientation)
+        orientation = np.mod(self.orientation + turn, 2.0 * np.pi)
+        sin1, cos1 = np.sin(orientation), np.cos(orientation)
+        self.x += np.where(straight, distance2 * cos0, radius * (sin1 - sin0))
+        self.y += np.where(straight, distance2 * sin0, radius * (cos0 - cos1))
+        self.orientation = orientation
+
+
+def make_robots(K, x=0.0, y=1.0, orientation=0.0, drift=0.0, steering_noise=0.0,
+                distance_noise=0.0, length=20.0):
+    robots = BatchRobot(K, length)
+    robots.set(x, y, orientation)
+    robots.set_noise(steering_noise, distance_noise)
+    robots.set_steering_drift(drift)
+    return robots
+
+
+# --------
+#
+# PID control runs of T steps for all robots. params is (K, 3) or
+# (K, 2) / (K, 1) for PD and P gains. Returns the x and y trajectories
+# and the CTE (robot.y before each move) as (K, T) arrays, written into
+# out = (x, y, cte) if given.
+#
+
+def run(robots, params, T, speed=1.0, seeds=None, rng=None, out=None):
+    K = robots.K
+    gains = np.zeros((K, 3))
+    params = np.atleast_2d(np.asarray(params, dtype=float))
+    gains[:, :params.shape[1]] = params
+    tau_p, tau_d, tau_i = gains.T
+
+    if out is None:
+        out = (np.empty((K, T)), np.empty((K, T)), np.empty((K, T)))
+    x_trajectory, y_trajectory, cte_trajectory = out
+
+    noise = None
+    if robots.steering_noise.any() or robots.distance_noise.any():
+        noise = np.empty((2, T, K))
+        if seeds is None:
+            rng = rng or np.random.default_rng()
+            noise[:] = rng.standard_normal((2, T, K))
+        else:
+            for k in range(K):
+                noise[:, :, k] = np.random.default_rng(seeds[k]).standard_normal((2, T))
+
+    prev_cte = robots.y.copy()
+    int_cte = np.zeros(K)
+    for t in range(T):
+        cte = robots.y.copy()
+        diff_cte = cte - prev_cte
+        int_cte += cte
+        prev_cte = cte
+        steer = -tau_p * cte - tau_d * diff_cte - tau_i * int_cte
+        robots.move(steer, speed, None if noise is None else noise[:, t])
+        x_trajectory[:, t] = robots.x
+        y_trajectory[:, t] = robots.y
+        cte_trajectory[:, t] = cte
+    return x_trajectory, y_trajectory, cte_trajectory
+
+
+# --------
+#
+# the error of twiddle.py for many gain vectors at once: 2n steps from
+# make_robot() and the mean squared CTE of the last n. This is a batch
+# cost for common/tuning.py:
+#   Tuner(twiddle_errors, batch=True).tune([0.0, 0.0, 0.0])
+#
+
+def twiddle_errors(params, seeds=None, n=100, speed=1.0, drift=10.0 / 180.0 * np.pi,
+                   steering_noise=0.0, distance_noise=0.0):
+    params = np.atleast_2d(np.asarray(params, dtype=float))
+    robots = make_robots(len(params), drift=drift, steering_noise=steering_noise,
+                         distance_noise=distance_noise)
+    cte = run(robots, params, 2 * n, speed, seeds)[2]
+    return (cte[:, n:] ** 2).sum(axis=1) / n
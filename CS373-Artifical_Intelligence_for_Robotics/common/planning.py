@@ -0,0 +1,391 @@
+import hashlib
+import heapq
+import os
+from array import array
+from collections import OrderedDict
+from math import *
+
+import numpy as np
+
+
+# ------------------------------------------------
+#
+# A* on occupancy grids
+#
+# GridPlanner is built once per map and answers any number of queries.
+# The open list is a binary heap (heapq) and the g-scores, parents,
+# expansion order and closed flags live in flat arrays indexed by cell.
+# The arrays are stamped with the query number instead of being cleared,
+# so a new query allocates nothing proportional to the map.
+#
+# The grid is padded with a border of obstacles, which removes all
+# bounds checks from the inner loop: a neighbour is just index + offset.
+#
+# grid format:
+#   0 = navigable space
+#   1 = occupied space
+#
+#   planner = GridPlanner(grid)
+#   cost, path = planner.search([0, 0], [4, 5])
+#   planner.expand_grid()       # like search() in ExpansionGrid.py
+#   planner.policy_grid()       # like search() in PrintPath.py
+#
+# With a HeuristicCache the planner uses the exact cost-to-go of the
+# goal as heuristic, computed once per (map, goal) and shared by all
+# planners on the same map:
+#
+#   cache = HeuristicCache(maxsize=32, directory='heuristics')
+#   planner = GridPlanner(grid, cache=cache)
+#
+
+delta4 = [[-1, 0],  # go up
+          [0, -1],  # go left
+          [1, 0],  # go down
+          [0, 1]]  # go right
+
+delta8 = delta4 + [[-1, -1], [1, -1], [1, 1], [-1, 1]]
+
+delta_name = ['^', '<', 'v', '>', '\\', '/', '\\', '/']
+
+
+class GridPlanner:
+
+    # --------
+    # init:
+    #    grid        - occupancy grid (0 free, 1 occupied)
+    #    cost        - cost of one straight step
+    #    connectivity - 4 or 8; diagonal steps cost sqrt(2) * cost
+    #    diagonal_cost - optional cost of a diagonal step instead
+    #    cell_cost   - optional per-cell weights (>= 1 keeps the default
+    #                  heuristic admissible); entering cell c costs
+    #                  step cost * cell_cost[c]
+    #    cache       - optional HeuristicCache for exact heuristics
+    #
+
+    def __init__(self, grid, cost=1, connectivity=4, cell_cost=None, cache=None,
+                 diagonal_cost=None):
+        grid = np.asarray(grid)
+        if connectivity not in (4, 8):
+            raise ValueError('connectivity must be 4 or 8')
+        self.rows, self.cols = grid.shape
+        self.cost = cost
+        self.connectivity = connectivity
+        self.diagonal_cost = sqrt(2.0) * cost if diagonal_cost is None else diagonal_cost
+        self.cache = cache
+        self.delta = delta4 if connectivity == 4 else delta8
+
+        # padded copy: row r, col c lives at (r + 1) * W + c + 1
+        self.W = self.cols + 2
+        blocked = np.ones((self.rows + 2, self.W), dtype=bool)
+        blocked[1:-1, 1:-1] = grid != 0
+        self._free = array('b', (~blocked).ravel().astype(np.int8).tobytes())
+
+        if cell_cost is None:
+            self._weight = None
+            self.min_weight = 1.0
+        else:
+            weight = np.ones((self.rows + 2, self.W))
+            weight[1:-1, 1:-1] = cell_cost
+            self._weight = array('d', weight.ravel().tobytes())
+            self.min_weight = float(np.min(cell_cost))
+
+        # identifies the map and the motion costs for the HeuristicCache
+        digest = hashlib.sha1()
+        digest.update(repr((grid.shape, cost, connectivity, self.diagonal_cost)).encode())
+        digest.update(blocked.tobytes())
+        if cell_cost is not None:
+            digest.update(weight.tobytes())
+        self.key = digest.hexdigest()
+
+        self._steps = [(dr * self.W + dc, self.diagonal_cost if dr and dc else cost)
+                       for dr, dc in self.delta]
+
+        size = (self.rows + 2) * self.W
+        self._g = array('d', bytes(8 * size))
+        self._parent = array('i', bytes(4 * size))
+        self._order = array('i', bytes(4 * size))
+        self._seen = array('i', bytes(4 * size))
+        self._closed = array('i', bytes(4 * size))
+        self._graph = None
+        self._stamp = 0
+        self._init = None
+        self._goal = None
+        self.expanded = 0
+
+    def index(self, cell):
+        return (cell[0] + 1) * self.W + cell[1] + 1
+
+    def cell(self, index):
+        r, c = divmod(index, self.W)
+        return [r - 1, c - 1]
+
+    # --------
+    #
+    # admissible default heuristic: Manhattan distance for 4-connected
+    # grids, octile distance for 8-connected ones
+    #
+
+    def default_heuristic(self, goal):
+        gr, gc = goal[0] + 1, goal[1] + 1
+        W = self.W
+        scale = self.cost * self.min_weight
+        if self.connectivity == 4:
+            def h(i):
+                r, c = divmod(i, W)
+                return scale * (abs(r - gr) + abs(c - gc))
+        else:
+            diagonal = (min(self.diagonal_cost, 2.0 * self.cost) - 2.0 * self.cost) \
+                * self.min_weight
+
+            def h(i):
+                r, c = divmod(i, W)
+                dr = abs(r - gr)
+                dc = abs(c - gc)
+                return scale * (dr + dc) + diagonal * min(dr, dc)
+        return h
+
+    # --------
+    #
+    # the moves as a sparse graph over the padded cells, reversed: the
+    # edge j -> i carries the cost of the move i -> j, so shortest paths
+    # from a goal in this graph are costs-to-go. Built once per planner.
+    #
+
+    def reverse_graph(self):
+        import scipy.sparse
+        if self._graph is not None:
+            return self._graph
+        size = len(self._free)
+        free = np.frombuffer(self._free, dtype=np.int8).astype(bool)
+        weight = None if self._weight is None else np.frombuffer(self._weight)
+        rows, cols, vals = [], [], []
+        for offset, step in self._steps:
+            lo, hi = max(0, -offset), min(size, size - offset)
+            i = np.arange(lo, hi)[free[lo:hi] & free[lo + offset:hi + offset]]
+            rows.append(i + offset)
+            cols.append(i)
+            vals.append(np.full(len(i), float(step)) if weight is None
+                        else step * weight[i + offset])
+        self._graph = scipy.sparse.csr_matrix((np.concatenate(vals),
+                                               (np.concatenate(rows), np.concatenate(cols))),
+                                              shape=(size, size))
+        return self._graph
+
+    # --------
+    #
+    # exact cost-to-go of every cell to the nearest of the goals
+    # (Dijkstra over the reversed moves), inf where none can be reached
+    #
+
+    def cost_to_go(self, goals):
+        import scipy.sparse.csgraph
+        goals = np.atleast_2d(goals)
+        d = scipy.sparse.csgraph.dijkstra(self.reverse_graph(),
+                                          indices=[self.index(g) for g in goals],
+                                          min_only=True)
+        return d.reshape(self.rows + 2, self.W)[1:-1, 1:-1]
+
+    # --------
+    #
+    # cost-to-go of the padded grid as used by the HeuristicCache: flat
+    # float32, rounded down so it stays admissible
+    #
+
+    def distance_field(self, goal):
+        import scipy.sparse.csgraph
+        d = scipy.sparse.csgraph.dijkstra(self.reverse_graph(), indices=self.index(goal))
+        field = d.astype(np.float32)
+        above = field > d
+        field[above] = np.nextafter(field[above], np.float32(0))
+        return field
+
+    # --------
+    #
+    # search: returns [path cost, path as a list of [row, col]] or 'fail'
+    #
+    #   heuristic - None for the default (the exact distance field if
+    #               the planner has a cache), a grid shaped array of values
+    #               (as in A-Start.py), or a function of [row, col]
+    #
+
+    def search(self, init, goal, heuristic=None):
+        if heuristic is None and self.cache is not None:
+            h = memoryview(self.cache.get(self, goal)).__getitem__
+        elif heuristic is None:
+            h = self.default_heuristic(goal)
+        elif callable(heuristic):
+            h = lambda i: heuristic(self.cell(i))
+        else:
+            values = np.zeros((self.rows + 2, self.W))
+            values[1:-1, 1:-1] = heuristic
+            values = values.ravel().tolist()
+            h = values.__getitem__
+
+        self._stamp += 1
+        stamp = self._stamp
+        free, weight, steps = self._free, self._weight, self._steps
+        g_score, parent, order = self._g, self._parent, self._order
+        seen, closed = self._seen, self._closed
+        push, pop = heapq.heappush, heapq.heappop
+
+        start = self.index(init)
+        target = self.index(goal)
+        self._init = start
+        self._goal = target
+        if not free[start] or not free[target] or h(start) == inf:
+            return 'fail'
+
+        g_score[start] = 0.0
+        parent[start] = -1
+        seen[start] = stamp
+        # ties on f go to the shallower node, as in A-Start.py; with the
+        # exact distance field every node on a shortest path has the same
+        # f, so ties go to the deeper one and the search runs straight
+        # down the path
+        sign = -1.0 if heuristic is None and self.cache is not None else 1.0
+        open = [(h(start), 0.0, start)]
+        count = 0
+
+        while open:
+            f, g, i = pop(open)
+            g = sign * g
+            if closed[i] == stamp:
+                continue
+            closed[i] = stamp
+            order[i] = count
+            count += 1
+
+            if i == target:
+                self.expanded = count
+                return [g, self.path(goal)]
+
+            for offset, step in steps:
+                j = i + offset
+                if not free[j] or closed[j] == stamp:
+                    continue
+                g2 = g + (step if weight is None else step * weight[j])
+                if seen[j] != stamp or g2 < g_score[j]:
+                    seen[j] = stamp
+                    g_score[j] = g2
+                    parent[j] = i
+                    f2 = g2 + h(j)
+                    if f2 < inf:
+                        push(open, (f2, sign * g2, j))
+
+        self.expanded = count
+        return 'fail'
+
+    # --------
+    #
+    # path from init to goal of the last search
+    #
+
+    def path(self, goal=None):
+        i = self._goal if goal is None else self.index(goal)
+        if self._seen[i] != self._stamp:
+            return []
+        path = []
+        while i != -1:
+            path.append(self.cell(i))
+            i = self._parent[i]
+        path.reverse()
+        return path
+
+    # --------
+    #
+    # the expand table of the last search: the step at which each cell
+    # was expanded, -1 if it was never expanded
+    #
+
+    def expand_grid(self):
+        expand = [[-1 for col in range(self.cols)] for row in range(self.rows)]
+        for r in range(self.rows):
+            for c in range(self.cols):
+                i = (r + 1) * self.W + c + 1
+                if self._closed[i] == self._stamp:
+                    expand[r][c] = self._order[i]
+        return expand
+
+    # --------
+    #
+    # the shortest path of the last search drawn with delta_name, goal
+    # marked with '*'
+    #
+
+    def policy_grid(self):
+        policy = [[' ' for col in range(self.cols)] for row in range(self.rows)]
+        path = self.path()
+        if not path:
+            return policy
+        for k in range(len(path) - 1):
+            move = [path[k + 1][0] - path[k][0], path[k + 1][1] - path[k][1]]
+            policy[path[k][0]][path[k][1]] = delta_name[self.delta.index(move)]
+        policy[path[-1][0]][path[-1][1]] = '*'
+        return policy
+
+
+# ------------------------------------------------
+#
+# LRU cache of distance fields keyed by (map, goal)
+#
+# Fields are kept in memory as flat float32 arrays of the padded grid;
+# the least recently used one is dropped when more than maxsize are
+# held. With a directory every field is also written there as .npy and
+# read back on a miss, so the fields survive the process.
+#
+
+class HeuristicCache:
+
+    def __init__(self, maxsize=32, directory=None):
+        self.maxsize = maxsize
+        self.directory = directory
+        self.fields = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if directory is not None and not os.path.isdir(directory):
+            os.makedirs(directory)
+
+    def filename(self, key):
+        return os.path.join(self.directory, '%s_%d_%d.npy' % key)
+
+    # --------
+    #
+    # field of planner.key and goal, computed by the planner if needed
+    #
+
+    def get(self, planner, goal):
+        key = (planner.key, goal[0], goal[1])
+        field = self.fields.get(key)
+        if field is not None:
+            self.fields.move_to_end(key)
+            self.hits += 1
+            return field
+
+        self.misses += 1
+        name = None if self.directory is None else self.filename(key)
+        if name is not None and os.path.exists(name):
+            field = np.load(name)
+        else:
+            field = planner.distance_field(goal)
+            if name is not None:
+                temp = name + '.tmp'
+                with open(temp, 'wb') as f:
+                    np.save(f, field)
+                os.replace(temp, name)
+
+        self.fields[key] = field
+        if len(self.fields) > self.maxsize:
+            self.fields.popitem(last=False)
+        return field
+
+    # --------
+    #
+    # the field as a grid (inf where the goal cannot be reached)
+    #
+
+    def field(self, planner, goal):
+        field = self.get(planner, goal)
+        return field.reshape(planner.rows + 2, planner.W)[1:-1, 1:-1]
+
+    def clear(self):
+        self.fields.clear()
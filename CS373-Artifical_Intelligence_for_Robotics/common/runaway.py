@@ -0,0 +1,175 @@
+from math import *
+
+import numpy as np
+
+
+# ------------------------------------------------
+#
+# streaming estimator for targets moving in a circle
+#
+# Every target is the runaway robot of RunawayRobot/robot.py: it turns
+# by a constant angle and drives a constant distance at every step. Its
+# state is
+#   [x, y, heading, turning, distance]
+# and M targets are filtered at once, as rows of x (M, 5) with
+# covariances P (M, 5, 5). Each measurement costs the same fixed amount
+# of work, whatever the number of measurements seen so far.
+#
+# The first three measurements of a target give the state directly:
+# the position, the heading and length of the last step, and the angle
+# between the last two steps. From the fourth on, an extended Kalman
+# filter predicts with the circle model and corrects with (x, y).
+#
+#   est = CircleEstimator(targets=2, measurement_noise=0.05)
+#   for Z in frames:              # Z is (M, 2), one point per target
+#       est.update(Z)
+#       est.next_pos()            # (M, 2) guesses for the next step
+#   est.predict(10)               # (M, 10, 2), 1 to 10 steps ahead
+#
+
+def angle_trunc(a):
+    return (a + pi) % (2.0 * pi) - pi
+
+
+class CircleEstimator:
+
+    def __init__(self, targets=1, measurement_noise=0.0, turning_noise=0.0,
+                 distance_noise=0.0):
+        self.M = targets
+        self.x = np.zeros((targets, 5))
+        self.P = np.zeros((targets, 5, 5))
+        # measurements seen per target, and the last two of them
+        self.count = np.zeros(targets, dtype=int)
+        self._last = np.zeros((targets, 2, 2))
+
+        # noise free measurements still need a positive-definite S
+        self.r2 = max(measurement_noise, 1e-6) ** 2
+        self.R = self.r2 * np.eye(2)
+        self.turning_noise = turning_noise
+        self.distance_noise = distance_noise
+
+    # --------
+    #
+    # motion model for the targets in rows: returns the predicted states
+    # and the Jacobians F (with respect to the state) and G (with
+    # respect to the turning and distance noise)
+    #
+
+    def motion(self, x):
+        heading = x[:, 2] + x[:, 3]
+        c, s, d = np.cos(heading), np.sin(heading), x[:, 4]
+        out = x.copy()
+        out[:, 0] += d * c
+        out[:, 1] += d * s
+        out[:, 2] = angle_trunc(heading)
+
+        n = len(x)
+        F = np.zeros((n, 5, 5))
+        F[:, range(5), range(5)] = 1.0
+        F[:, 0, 2] = F[:, 0, 3] = -d * s
+        F[:, 1, 2] = F[:, 1, 3] = d * c
+        F[:, 0, 4] = c
+        F[:, 1, 4] = s
+        F[:, 2, 3] = 1.0
+
+        G = np.zeros((n, 5, 2))
+        G[:, 0, 0] = -d * s
+        G[:, 1, 0] = d * c
+        G[:, 2, 0] = 1.0
+        G[:, 0, 1] = c
+        G[:, 1, 1] = s
+        return out, F, G
+
+    # --------
+    #
+    # measurement update with Z (M, 2); mask selects the targets that
+    # were observed in this frame. Returns next_pos().
+    #
+
+    def update(self, Z, mask=None):
+        Z = np.asarray(Z, dtype=float).reshape(self.M, 2)
+        if mask is None:
+            mask = np.ones(self.M, dtype=bool)
+        else:
+            mask = np.asarray(mask, dtype=bool)
+
+        tracking = mask & (self.count >= 3)
+        if tracking.any():
+            self._filter(np.flatnonzero(tracking), Z)
+
+        for n in (0, 1, 2):
+            rows = np.flatnonzero(mask & (self.count == n))
+            if len(rows):
+                self._start(rows, Z[rows], n)
+
+        self._last[mask, 0] = self._last[mask, 1]
+        self._last[mask, 1] = Z[mask]
+        self.count[mask] += 1
+        return self.next_pos()
+
+    def _filter(self, rows, Z):
+        x, F, G = self.motion(self.x[rows])
+        P = np.matmul(np.matmul(F, self.P[rows]), F.transpose(0, 2, 1))
+        q = np.array([self.turning_noise ** 2, self.distance_noise ** 2])
+        P += np.matmul(G * q, G.transpose(0, 2, 1))
+
+        # H picks (x, y): S = P[:2, :2] + R and K = P[:, :2] S^-1
+        y = Z[rows] - x[:, :2]
+        S = P[:, :2, :2] + self.R
+        HP = P[:, :2, :]
+        K = np.linalg.solve(S, HP).transpose(0, 2, 1)
+        x += np.einsum('mij,mj->mi', K, y)
+        x[:, 2] = angle_trunc(x[:, 2])
+        P -= np.matmul(K, HP)
+
+        self.x[rows] = x
+        self.P[rows] = P
+
+    # --------
+    #
+    # the state from the first measurements: after one it stands still,
+    # after two it drives straight, after three it turns
+    #
+
+    def _start(self, rows, Z, n):
+        x = self.x[rows]
+        x[:, :2] = Z
+        x[:, 2:] = 0.0
+        if n >= 1:
+            step = Z - self._last[rows, 1]
+            x[:, 2] = np.arctan2(step[:, 1], step[:, 0])
+            x[:, 4] = np.hypot(step[:, 0], step[:, 1])
+        if n == 2:
+            before = self._last[rows, 1] - self._last[rows, 0]
+            x[:, 3] = angle_trunc(x[:, 2] - np.arctan2(before[:, 1], before[:, 0]))
+
+            # rough spread of the three point estimate
+            d2 = np.maximum(x[:, 4] ** 2, self.r2)
+            P = np.zeros((len(rows), 5, 5))
+            P[:, 0, 0] = P[:, 1, 1] = self.r2
+            P[:, 2, 2] = 2.0 * self.r2 / d2
+            P[:, 3, 3] = 6.0 * self.r2 / d2
+            P[:, 4, 4] = 2.0 * self.r2
+            self.P[rows] = P
+        self.x[rows] = x
+
+    # --------
+    #
+    # positions 1 to k steps ahead for every target, (M, k, 2); the
+    # state is not changed
+    #
+
+    def predict(self, k=1):
+        x = self.x
+        j = np.arange(1, k + 1)
+        heading = x[:, 2:3] + j * x[:, 3:4]
+        out = np.empty((self.M, k, 2))
+        np.cumsum(np.cos(heading), axis=1, out=out[:, :, 0])
+        np.cumsum(np.sin(heading), axis=1, out=out[:, :, 1])
+        out *= x[:, 4, None, None]
+        out += x[:, None, :2]
+        return out
+
+    def next_pos(self):
+        return self.predict(1)[:, 0]
+
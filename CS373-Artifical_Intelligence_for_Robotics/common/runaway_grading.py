@@ -0,0 +1,200 @@
+from concurrent.futures import ProcessPoolExecutor
+from math import *
+
+import numpy as np
+
+from common.runaway import CircleEstimator, angle_trunc
+
+
+# ------------------------------------------------
+#
+# Monte-Carlo grading of runaway robot estimators
+#
+# demo_grading() of RunawayRobot/main.py moves one target and asks the
+# estimator for its next position until the guess is within
+# 0.01 * distance. Here many independent targets do the same in
+# lockstep: their (x, y, heading) are rows of one array moved by
+# move_in_circle(), and a batch estimator (see common/runaway.py) sees
+# one row of measurements per step. The trials are cut into chunks of
+# chunk_size with one seed each, and the chunks run over a process pool,
+# so the results do not depend on the number of workers.
+#
+# Every trial draws its own target from the seed of its chunk, uniformly
+# within target_ranges (the turning rate with either sign), as the
+# grader does; target=default_target runs the demo target of main.py in
+# every trial instead.
+#
+#   steps = run_trials(CircleEstimator, 1000, seed=1, measurement_noise=0.075)
+#   report(steps)['hit_rate'], report(steps)['median'], ...
+#
+# steps[i] is the step at which trial i was localized, or -1.
+#
+
+default_target = dict(x=2.1,
+                      y=4.3,
+                      heading=0.5,
+                      turning=2 * pi / 34.0,
+                      distance=1.5)
+
+target_ranges = dict(x=(-20.0, 20.0),
+                     y=(-20.0, 20.0),
+                     heading=(-pi, pi),
+                     turning=(2 * pi / 60.0, 2 * pi / 10.0),
+                     distance=(1.0, 2.0))
+
+
+# --------
+#
+# (x, y, heading, turning, distance) of n targets as (n,) arrays: drawn
+# from target_ranges, or the values of target for all of them
+#
+
+def make_targets(n, rng, target=None):
+    if target is not None:
+        p = dict(default_target)
+        p.update(target)
+        return dict((k, np.full(n, float(p[k]))) for k in target_ranges)
+    p = dict((k, rng.uniform(lo, hi, n)) for k, (lo, hi) in sorted(target_ranges.items()))
+    p['turning'] *= rng.choice([-1.0, 1.0], n)
+    return p
+
+
+# --------
+#
+# robot.move_in_circle() and robot.sense() for all rows of state
+# (n, 3) = x, y, heading; turning and distance are scalars or (n,)
+#
+
+def move_in_circle(state, turning, distance, turning_noise=0.0, distance_noise=0.0,
+                   rng=None, max_turning_angle=pi):
+    n = len(state)
+    turning = np.broadcast_to(turning, n)
+    distance = np.broadcast_to(distance, n)
+    if turning_noise:
+        turning = rng.normal(turning, turning_noise)
+    if distance_noise:
+        distance = rng.normal(distance, distance_noise)
+    turning = np.clip(turning, -max_turning_angle, max_turning_angle)
+    distance = np.maximum(distance, 0.0)
+
+    state[:, 2] = angle_trunc(state[:, 2] + turning)
+    state[:, 0] += distance * np.cos(state[:, 2])
+    state[:, 1] += distance * np.sin(state[:, 2])
+    return state
+
+
+def sense(state, measurement_noise=0.0, rng=None):
+    if measurement_noise:
+        return rng.normal(state[:, :2], measurement_noise)
+    return state[:, :2].copy()
+
+
+# --------
+#
+# estimate_next_pos(measurement, OTHER) functions as a batch estimator,
+# one OTHER per target (the noise keywords are ignored). main.py is
+# Python 2 and cannot be imported here; its strategies work once written
+# in Python 3:
+#
+#   def naive_next_pos(measurement, OTHER=None):
+#       if not OTHER:
+#           OTHER = measurement
+#       return OTHER, OTHER
+#
+#   run_trials(functools.partial(NextPosEstimator, naive_next_pos), 100)
+#
+
+class NextPosEstimator:
+
+    def __init__(self, fcn, targets, **noise):
+        self.fcn = fcn
+        self.OTHER = [None] * targets
+
+    def update(self, Z):
+        guesses = np.empty((len(Z), 2))
+        for i in range(len(Z)):
+            guesses[i], self.OTHER[i] = self.fcn(tuple(Z[i]), self.OTHER[i])
+        return guesses
+
+
+# --------
+#
+# one chunk of trials in this process. The estimator is built with
+# make_estimator(targets, measurement_noise=..., turning_noise=...,
+# distance_noise=...) and must return its (n, 2) guesses from update(Z).
+# Targets keep moving after their capture, only their step is recorded.
+#
+
+def run_chunk(make_estimator, trials, seed, target=None, measurement_noise=0.0,
+              turning_noise=0.0, distance_noise=0.0, max_steps=1000):
+    rng = np.random.default_rng(seed)
+    p = make_targets(trials, rng, target)
+
+    state = np.column_stack([p['x'], p['y'], p['heading']])
+    estimator = make_estimator(trials, measurement_noise=measurement_noise,
+                               turning_noise=turning_noise,
+                               distance_noise=distance_noise)
+    tolerance = 0.01 * p['distance']
+    steps = np.full(trials, -1)
+
+    for ctr in range(1, max_steps + 1):
+        guess = estimator.update(sense(state, measurement_noise, rng))
+        move_in_circle(state, p['turning'], p['distance'], turning_noise,
+                       distance_noise, rng)
+        error = np.hypot(guess[:, 0] - state[:, 0], guess[:, 1] - state[:, 1])
+        steps[(steps < 0) & (error <= tolerance)] = ctr
+        if steps.min() > 0:
+            break
+    return steps
+
+
+def _run_chunk(args):
+    return run_chunk(*args[0], **args[1])
+
+
+# --------
+#
+# runs all trials over a process pool, in chunks of chunk_size trials
+# with a seed each. workers=1 runs them in this process.
+#
+
+def run_trials(make_estimator=CircleEstimator, trials=1000, seed=0, target=None,
+               measurement_noise=0.0, turning_noise=0.0, distance_noise=0.0,
+               max_steps=1000, workers=None, chunk_size=250):
+    bounds = list(range(0, trials, chunk_size)) + [trials]
+    seeds = np.random.SeedSequence(seed).spawn(len(bounds) - 1)
+    options = dict(target=target, measurement_noise=measurement_noise,
+                   turning_noise=turning_noise, distance_noise=distance_noise,
+                   max_steps=max_steps)
+    tasks = [((make_estimator, bounds[i + 1] - bounds[i], seeds[i]), options)
+             for i in range(len(seeds))]
+
+    if workers == 1:
+        chunks = [_run_chunk(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(_run_chunk, tasks))
+    return np.concatenate(chunks)
+
+
+# --------
+#
+# step-to-capture distribution of run_trials(): hit rate, summary
+# statistics of the localized trials and counts per step
+#
+
+def report(steps):
+    steps = np.asarray(steps)
+    hits = steps[steps > 0]
+    result = dict(trials=len(steps),
+                  localized=len(hits),
+                  hit_rate=len(hits) / float(max(len(steps), 1)),
+                  histogram=np.bincount(hits).tolist() if len(hits) else [])
+    if len(hits):
+        q = np.percentile(hits, [5, 25, 50, 75, 95])
+        result.update(mean=float(hits.mean()),
+                      min=int(hits.min()),
+                      max=int(hits.max()),
+                      median=float(q[2]),
+                      percentiles=dict(zip([5, 25, 50, 75, 95], q.tolist())))
+    return result
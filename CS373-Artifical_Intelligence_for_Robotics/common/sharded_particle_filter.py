@@ -0,0 +1,272 @@
+import multiprocessing
+import time
+from math import *
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from common.particle_filter import CarParticleFilter
+
+
+# ------------------------------------------------
+#
+# sharded particle filter
+#
+# The particles live in shared memory, split into one contiguous shard
+# per worker process. Every worker runs the motion model and the
+# likelihood of its own shard in place, using one of the models of
+# common/particle_filter.py. Only three numbers per shard travel back
+# through the pipes: the largest log-weight and the sums of the weights
+# and squared weights relative to it. From those the parent process
+# gets the effective sample size and, for resampling, how many of the N
+# systematic pointers fall into each shard; each worker then copies its
+# share of the new particles into a second shared buffer.
+#
+#   with ShardedParticleFilter(CarParticleFilter, 1000000, workers=8,
+#                              landmarks=landmarks) as pf:
+#       for t in range(len(motions)):
+#           pf.update(motions[t], measurements[t])
+#       print(pf.get_position())
+#
+
+class ShardedParticleFilter:
+
+    def __init__(self, model, N, workers=None, seed=None, ess_threshold=0.5,
+                 **model_kwargs):
+        self.N = N
+        self.workers = workers or multiprocessing.cpu_count()
+        self.ess_threshold = ess_threshold
+        self.rng = np.random.default_rng(seed)
+        self.resampled = 0
+        # one particle of the model, to check motions before they are sent
+        self._model = model(1, **model_kwargs)
+
+        # two state buffers (x, y, orientation) to resample between,
+        # and the log-weights
+        self._memory = [shared_memory.SharedMemory(create=True, size=3 * N * 8),
+                        shared_memory.SharedMemory(create=True, size=3 * N * 8),
+                        shared_memory.SharedMemory(create=True, size=N * 8)]
+        self._states = [np.ndarray((3, N), buffer=m.buf) for m in self._memory[:2]]
+        self._log_weights = np.ndarray(N, buffer=self._memory[2].buf)
+        self._log_weights[:] = 0.0
+        self._current = 0
+
+        bounds = np.linspace(0, N, self.workers + 1).astype(int)
+        self._shards = list(zip(bounds[:-1], bounds[1:]))
+        seeds = np.random.SeedSequence(seed).spawn(self.workers)
+        names = [m.name for m in self._memory]
+
+        self._pipes = []
+        self._processes = []
+        for i in range(self.workers):
+            parent, child = multiprocessing.Pipe()
+            p = multiprocessing.Process(target=_worker,
+                                        args=(child, names, N, self._shards[i],
+                                              model, model_kwargs, seeds[i]))
+            p.daemon = True
+            p.start()
+            self._pipes.append(parent)
+            self._processes.append(p)
+        self._call([('init', self._current)] * self.workers)
+
+    # --------
+    #
+    # sends one command to every worker and collects the answers
+    #
+
+    def _call(self, commands):
+        for pipe, command in zip(self._pipes, commands):
+            pipe.send(command)
+        answers = [pipe.recv() for pipe in self._pipes]
+        for answer in answers:
+            if isinstance(answer, Exception):
+                raise answer
+        return answers
+
+    # --------
+    #
+    # motion and measurement update on all shards, resampling when the
+    # effective sample size drops below ess_threshold * N. Shards whose
+    # particles all have zero weight report a log-weight of -inf; only
+    # when all of them do are the weights reset.
+    #
+
+    def update(self, motion, measurement):
+        self._model.move(motion)
+        sums = np.array(self._call([('step', self._current, motion, measurement)]
+                                   * self.workers))
+        M = sums[:, 0].max()
+        if not np.isfinite(M):
+            self._log_weights[:] = 0.0
+            return
+        scale = np.exp(sums[:, 0] - M)
+        totals = sums[:, 1] * scale
+        W = totals.sum()
+        W2 = (sums[:, 2] * scale ** 2).sum()
+        if W * W / W2 < self.ess_threshold * self.N:
+            self._resample(M, W, totals / W)
+
+    def _resample(self, M, W, fractions):
+        u = self.rng.random()
+        start = np.concatenate([[0.0], np.cumsum(fractions)])
+        # pointers (u + k) / N with start[s] <= pointer < start[s + 1]
+        k = np.clip(np.ceil(start * self.N - u), 0, self.N).astype(int)
+        k[-1] = self.N
+        commands = [('resample', self._current, u, k[s], k[s + 1], start[s], M, W)
+                    for s in range(self.workers)]
+        self._call(commands)
+        self._current = 1 - self._current
+        self._log_weights[:] = 0.0
+        self.resampled += 1
+
+    # --------
+    #
+    # weighted mean of all particles, orientation normalized around the
+    # first particle
+    #
+
+    def get_position(self):
+        x, y, orientation = self._states[self._current]
+        w = np.exp(self._log_weights - self._log_weights.max())
+        w /= w.sum()
+        o0 = orientation[0]
+        orientation = ((orientation - o0 + pi) % (2.0 * pi)) + o0 - pi
+        return [float(np.dot(w, x)), float(np.dot(w, y)), float(np.dot(w, orientation))]
+
+    # --------
+    #
+    # stops the workers and releases the shared memory
+    #
+
+    def close(self):
+        if not self._processes:
+            return
+        try:
+            for pipe in self._pipes:
+                try:
+                    pipe.send(('stop',))
+                except (BrokenPipeError, EOFError, OSError):
+                    pass
+            for p in self._processes:
+                p.join(timeout=5.0)
+                if p.is_alive():
+                    p.terminate()
+                    p.join()
+        finally:
+            for pipe in self._pipes:
+                pipe.close()
+            self._processes = []
+            self._states = None
+            self._log_weights = None
+            for m in self._memory:
+                m.close()
+                m.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# --------
+#
+# worker process: owns the particles [lo, hi) and a model instance of
+# that size whose arrays are swapped in and out of shared memory
+#
+
+def _worker(pipe, names, N, shard, model, model_kwargs, seed):
+    memory = [shared_memory.SharedMemory(name=name) for name in names]
+    states = [np.ndarray((3, N), buffer=m.buf) for m in memory[:2]]
+    log_weights = np.ndarray(N, buffer=memory[2].buf)
+    lo, hi = shard
+    pf = model(hi - lo, seed=seed, **model_kwargs)
+
+    while True:
+        command = pipe.recv()
+        if command[0] == 'stop':
+            break
+        try:
+            _handle(command, pipe, states, log_weights, N, lo, hi, pf)
+        except Exception as e:
+            # raised again by the parent, the worker keeps serving
+            pipe.send(e)
+
+    del states, log_weights
+    for m in memory:
+        m.close()
+
+
+# --------
+#
+# one command of the parent on the shard [lo, hi)
+#
+
+def _handle(command, pipe, states, log_weights, N, lo, hi, pf):
+    if command[0] == 'init':
+        state = states[command[1]]
+        state[0, lo:hi] = pf.x
+        state[1, lo:hi] = pf.y
+        state[2, lo:hi] = pf.orientation
+        pipe.send(None)
+
+    elif command[0] == 'step':
+        state, motion, measurement = states[command[1]], command[2], command[3]
+        pf.x, pf.y, pf.orientation = state[0, lo:hi], state[1, lo:hi], state[2, lo:hi]
+        pf.move(motion)
+        state[0, lo:hi] = pf.x
+        state[1, lo:hi] = pf.y
+        state[2, lo:hi] = pf.orientation
+        log_weights[lo:hi] += pf.log_likelihood(measurement)
+
+        lw = log_weights[lo:hi]
+        m = lw.max()
+        if not np.isfinite(m):
+            pipe.send((-inf, 0.0, 0.0))
+            return
+        w = np.exp(lw - m)
+        pipe.send((m, w.sum(), np.dot(w, w)))
+
+    elif command[0] == 'resample':
+        current, u, k0, k1, start, M, W = command[1:]
+        src, dst = states[current], states[1 - current]
+        if k1 > k0:
+            cumulative = start + np.cumsum(np.exp(log_weights[lo:hi] - M)) / W
+            positions = (u + np.arange(k0, k1)) / N
+            index = np.searchsorted(cumulative, positions, side='right')
+            index = lo + np.minimum(index, hi - lo - 1)
+            dst[:, k0:k1] = src[:, index]
+        pipe.send(None)
+
+
+# ------------------------------------------------
+#
+# benchmark: particle updates per second of the car filter with 1 .. N
+# worker processes, against the single process CarParticleFilter
+#
+
+def benchmark(N=1000000, steps=8, max_workers=None):
+    motions = [[2. * pi / 10, 20.] for row in range(steps)]
+    measurements = [[4.746936, 3.859782, 3.045217, 2.045506]] * steps
+    landmarks = [[0.0, 100.0], [0.0, 0.0], [100.0, 0.0], [100.0, 100.0]]
+    max_workers = max_workers or multiprocessing.cpu_count()
+
+    pf = CarParticleFilter(N, landmarks, seed=0)
+    start = time.time()
+    for t in range(steps):
+        pf.update(motions[t], measurements[t])
+    base = N * steps / (time.time() - start)
+    print('single process:  %12.0f particles/s' % base)
+
+    for workers in range(1, max_workers + 1):
+        with ShardedParticleFilter(CarParticleFilter, N, workers, seed=0,
+                                   landmarks=landmarks) as pf:
+            start = time.time()
+            for t in range(steps):
+                pf.update(motions[t], measurements[t])
+            rate = N * steps / (time.time() - start)
+        print('%2d workers:      %12.0f particles/s  (%.2fx)' % (workers, rate, rate / base))
+
+
+if __name__ == '__main__':
+    benchmark()
@@ -0,0 +1,443 @@
+from math import *
+import random
+
+import numpy as np
+
+from common.matrix import matrix
+
+
+# ------------------------------------------------
+#
+# sparse GraphSLAM
+#
+# In the rectolinear world of the GraphSLAM exercises the x and y
+# coordinates never interact, so the interlaced 2(N+L) system of slam()
+# splits into one (N+L) system with two right hand sides. Its Omega has
+# a constant number of entries per constraint, so it is collected as COO
+# triplets and handed to a sparse solver instead of being inverted.
+#
+
+# --------
+#
+# collects the constraints of data into the (rows, cols, vals) triplets
+# of the one-axis Omega and the (N+L) x 2 Xi
+#
+
+def constraint_triplets(data, N, num_landmarks, motion_noise, measurement_noise,
+                        world_size=100.0):
+    dim = N + num_landmarks
+    steps = len(data)
+
+    # measurements: pose k sees landmark i at [dx, dy]
+    poses = []
+    marks = []
+    Z = []
+    for k in range(steps):
+        for measurement in data[k][0]:
+            poses.append(k)
+            marks.append(N + measurement[0])
+            Z.append(measurement[1:3])
+    poses = np.array(poses, dtype=int)
+    marks = np.array(marks, dtype=int)
+    Z = np.array(Z, dtype=float).reshape(-1, 2)
+
+    # motions: pose k moves to pose k + 1 by [dx, dy]
+    k = np.arange(steps)
+    U = np.array([data[t][1] for t in range(steps)], dtype=float).reshape(-1, 2)
+
+    w_z = 1.0 / measurement_noise
+    w_u = 1.0 / motion_noise
+    ones_z = np.full(len(poses), w_z)
+    ones_u = np.full(steps, w_u)
+
+    rows = np.concatenate([[0], poses, marks, poses, marks, k, k + 1, k, k + 1])
+    cols = np.concatenate([[0], poses, marks, marks, poses, k, k + 1, k + 1, k])
+    vals = np.concatenate([[1.0], ones_z, ones_z, -ones_z, -ones_z,
+                           ones_u, ones_u, -ones_u, -ones_u])
+
+    Xi = np.zeros((dim, 2))
+    Xi[0] = world_size / 2.0
+    for b in range(2):
+        Xi[:, b] += np.bincount(poses, -Z[:, b] * w_z, minlength=dim)
+        Xi[:, b] += np.bincount(marks, Z[:, b] * w_z, minlength=dim)
+        Xi[:, b] += np.bincount(k, -U[:, b] * w_u, minlength=dim)
+        Xi[:, b] += np.bincount(k + 1, U[:, b] * w_u, minlength=dim)
+
+    return rows, cols, vals, Xi
+
+
+# --------
+#
+# builds the one-axis Omega (sparse) and the (N+L) x 2 Xi of data
+#
+
+def information_system(data, N, num_landmarks, motion_noise, measurement_noise,
+                       world_size=100.0):
+    import scipy.sparse
+    dim = N + num_landmarks
+    rows, cols, vals, Xi = constraint_triplets(data, N, num_landmarks, motion_noise,
+                                               measurement_noise, world_size)
+    # duplicate triplets are summed on conversion
+    Omega = scipy.sparse.csc_matrix((vals, (rows, cols)), shape=(dim, dim))
+    return Omega, Xi
+
+
+# --------
+#
+# solves Omega mu = Xi for both axes
+#
+#   method='direct' factorizes Omega once with SuperLU and solves both
+#   axes with the factors, method='cg' runs Jacobi preconditioned conjugate
+#   gradients per axis (Omega is symmetric positive definite).
+#
+
+def solve_information(Omega, Xi, method='direct', tol=1.0e-10):
+    import scipy.sparse
+    import scipy.sparse.linalg
+    if method == 'direct':
+        # symmetric minimum degree ordering keeps the fill-in of the pose
+        # chain and the landmark columns small
+        lu = scipy.sparse.linalg.splu(Omega, permc_spec='MMD_AT_PLUS_A',
+                                      options=dict(SymmetricMode=True))
+        return lu.solve(Xi)
+    elif method == 'cg':
+        M = scipy.sparse.diags(1.0 / Omega.diagonal())
+        mu = np.zeros(Xi.shape)
+        for b in range(Xi.shape[1]):
+            mu[:, b], info = scipy.sparse.linalg.cg(Omega, Xi[:, b], rtol=tol, M=M)
+            if info != 0:
+                raise ValueError("conjugate gradient did not converge")
+        return mu
+    else:
+        raise ValueError("Unknown method: " + str(method))
+
+
+# --------
+#
+# sparse_slam - same inputs and same mu as slam() in Full_SLAM.py
+#
+
+def sparse_slam(data, N, num_landmarks, motion_noise, measurement_noise,
+                world_size=100.0, method='direct', tol=1.0e-10):
+    Omega, Xi = information_system(data, N, num_landmarks, motion_noise,
+                                   measurement_noise, world_size)
+    mu = solve_information(Omega, Xi, method, tol)
+
+    # interlace x and y again: [Px0, Py0, Px1, Py1, ..., Lx0, Ly0, ...]
+    return matrix(mu.reshape(-1, 1))
+
+
+# ------------------------------------------------
+#
+# incremental online SLAM
+#
+# Keeps the information form of online_slam() (current pose plus all
+# landmarks) and updates it in place. As above only one axis is stored,
+# Xi carries the x and y columns. The pose is kept in the last slot so
+# that the rank-1 changes below touch as little of the factor as possible.
+#
+# Moving by u adds the new pose and marginalizes the old one. With
+# o = Omega[p, p] + 1/motion_noise this is exactly
+#
+#     Omega <- Omega - v v^T,    v = Omega[:, p] / sqrt(o)
+#
+# (the 2x2 pose block of the interlaced form is diagonal, so the Schur
+# complement needs a single division). Every measurement is a rank-1
+# update as well, so a cached Cholesky factor of Omega is brought up to
+# date with rank-1 updates/downdates instead of being recomputed.
+#
+
+class OnlineSLAM:
+
+    # The rank-1 updates of cholupdate() cost a Python loop over the
+    # columns, so they only beat refactoring in LAPACK for a few terms.
+    # Measured (one CPU, per estimate): refactoring at dim 1024 / 2048 /
+    # 4096 costs as much as 3.5 / 3.4 / 7.5 updates, and below dim 1024
+    # it is always faster. Beyond max_pending terms the factor is
+    # dropped and computed again.
+    update_min_dim = 1024
+    max_pending = 3
+
+    def __init__(self, num_landmarks, motion_noise, measurement_noise, world_size=100.0):
+        self.num_landmarks = num_landmarks
+        self.motion_noise = motion_noise
+        self.measurement_noise = measurement_noise
+        self.dim = num_landmarks + 1
+        self.pose = num_landmarks
+
+        self.Omega = np.zeros((self.dim, self.dim))
+        self.Omega[self.pose, self.pose] = 1.0
+        self.Xi = np.zeros((self.dim, 2))
+        self.Xi[self.pose] = world_size / 2.0
+
+        self._R = None
+        self._pending = []
+
+    # --------
+    #
+    # integrates the measurements [[i, dx, dy], ...] of the current pose
+    #
+
+    def sense(self, Z):
+        if len(Z) == 0:
+            return
+        Z = np.asarray(Z, dtype=float)
+        marks = Z[:, 0].astype(int)
+        w = 1.0 / self.measurement_noise
+        p = self.pose
+
+        self.Omega[p, p] += w * len(marks)
+        np.add.at(self.Omega, (marks, marks), w)
+        np.add.at(self.Omega, (marks, p), -w)
+        np.add.at(self.Omega, (p, marks), -w)
+        self.Xi[p] -= w * Z[:, 1:3].sum(axis=0)
+        np.add.at(self.Xi, marks, w * Z[:, 1:3])
+
+        for i in marks:
+            self._record([i, p], [-np.sqrt(w), np.sqrt(w)], 1.0)
+
+    # --------
+    #
+    # moves the pose by motion = [dx, dy] and factors out the previous one
+    #
+
+    def move(self, motion):
+        w = 1.0 / self.motion_noise
+        p = self.pose
+        u = np.asarray(motion, dtype=float)
+
+        o = self.Omega[p, p] + w
+        nz = np.flatnonzero(self.Omega[:, p])
+        marks = nz[nz != p]
+        v = self.Omega[nz, p] / np.sqrt(o)
+
+        # Xi of the old pose once the motion constraint is added
+        xp = self.Xi[p] - w * u
+        self.Xi[marks] -= np.outer(self.Omega[marks, p], xp) / o
+        self.Xi[p] = w * u + w * xp / o
+        self.Omega[np.ix_(nz, nz)] -= np.outer(v, v)
+
+        self._record(nz, v, -1.0)
+
+    # --------
+    #
+    # keeps a rank-1 change sign * x x^T of Omega as the nonzeros
+    # (index, value) of x while a cached factor can take it
+    #
+
+    def _record(self, index, value, sign):
+        if self._R is None or self.dim < self.update_min_dim:
+            return
+        if len(self._pending) >= self.max_pending:
+            self._R = None
+            self._pending = []
+            return
+        self._pending.append((np.array(index), np.array(value, dtype=float), sign))
+
+    # --------
+    #
+    # returns the current estimate, laid out like online_slam():
+    # [Px, Py, Lx0, Ly0, ...] as a matrix column
+    #
+
+    def estimate(self):
+        import scipy.linalg
+        R = self.factor()
+        mu = scipy.linalg.solve_triangular(R, self.Xi, trans='T')
+        mu = scipy.linalg.solve_triangular(R, mu)
+        return matrix(mu[self._order()].reshape(2 * self.dim, 1))
+
+    # --------
+    #
+    # returns Omega interlaced as in online_slam()
+    #
+
+    def information(self):
+        order = self._order()
+        return matrix(np.kron(self.Omega[np.ix_(order, order)], np.eye(2)))
+
+    # --------
+    #
+    # returns the upper Cholesky factor R of Omega (R^T R = Omega)
+    #
+
+    def factor(self):
+        import scipy.linalg
+        if self._R is None or self.dim < self.update_min_dim:
+            try:
+                self._R = scipy.linalg.cholesky(self.Omega)
+            except np.linalg.LinAlgError:
+                raise ValueError("Matrix not positive-definite")
+        else:
+            for index, value, sign in self._pending:
+                v = np.zeros(self.dim)
+                v[index] = value
+                cholupdate(self._R, v, sign)
+        self._pending = []
+        return self._R
+
+    def _order(self):
+        return [self.pose] + list(range(self.num_landmarks))
+
+
+# --------
+#
+# rank-1 update (sign=1) or downdate (sign=-1) of an upper triangular
+# Cholesky factor in place: R^T R + sign * x x^T
+#
+
+def cholupdate(R, x, sign=1.0):
+    x = np.array(x, dtype=float)
+    n = len(x)
+    nz = np.flatnonzero(x)
+    if len(nz) == 0:
+        return R
+    for k in range(nz[0], n):
+        if x[k] == 0.0:
+            continue
+        d = R[k, k] ** 2 + sign * x[k] ** 2
+        if d <= 0.0:
+            raise ValueError("Matrix not positive-definite")
+        r = np.sqrt(d)
+        c = r / R[k, k]
+        s = x[k] / R[k, k]
+        R[k, k] = r
+        R[k, k + 1:] = (R[k, k + 1:] + sign * s * x[k + 1:]) / c
+        x[k + 1:] = c * x[k + 1:] - s * R[k, k + 1:]
+    return R
+
+
+# --------
+#
+# incremental_online_slam - same inputs and same (mu, Omega) as
+# online_slam() in Online_SLAM.py
+#
+
+def incremental_online_slam(data, N, num_landmarks, motion_noise, measurement_noise,
+                            world_size=100.0):
+    slam = OnlineSLAM(num_landmarks, motion_noise, measurement_noise, world_size)
+    for k in range(len(data)):
+        slam.sense(data[k][0])
+        slam.move(data[k][1])
+    return slam.estimate(), slam.information()
+
+
+# ------------------------------------------------
+#
+# the robot and data generator of the GraphSLAM exercises
+#
+# Same world as in Full_SLAM.py and Online_SLAM.py, but every random
+# number comes from rng (a random.Random) so that a dataset can be
+# reproduced from a seed, and make_data does not print.
+#
+
+class robot:
+
+    def __init__(self, world_size=100.0, measurement_range=30.0,
+                 motion_noise=1.0, measurement_noise=1.0, rng=random):
+        self.world_size = world_size
+        self.measurement_range = measurement_range
+        self.x = world_size / 2.0
+        self.y = world_size / 2.0
+        self.motion_noise = motion_noise
+        self.measurement_noise = measurement_noise
+        self.landmarks = []
+        self.num_landmarks = 0
+        self.rng = rng
+
+    def rand(self):
+        return self.rng.random() * 2.0 - 1.0
+
+    # --------
+    #
+    # make random landmarks located in the world
+    #
+
+    def make_landmarks(self, num_landmarks):
+        self.landmarks = []
+        for i in range(num_landmarks):
+            self.landmarks.append([round(self.rng.random() * self.world_size),
+                                   round(self.rng.random() * self.world_size)])
+        self.num_landmarks = num_landmarks
+
+    # --------
+    #
+    # move: attempts to move robot by dx, dy. If outside world
+    #       boundary, then the move does nothing and instead returns failure
+    #
+
+    def move(self, dx, dy):
+        x = self.x + dx + self.rand() * self.motion_noise
+        y = self.y + dy + self.rand() * self.motion_noise
+
+        if x < 0.0 or x > self.world_size or y < 0.0 or y > self.world_size:
+            return False
+        self.x = x
+        self.y = y
+        return True
+
+    # --------
+    #
+    # sense: returns x- and y- distances to landmarks within visibility range
+    #
+
+    def sense(self):
+        Z = []
+        for i in range(self.num_landmarks):
+            dx = self.landmarks[i][0] - self.x + self.rand() * self.measurement_noise
+            dy = self.landmarks[i][1] - self.y + self.rand() * self.measurement_noise
+            if self.measurement_range < 0.0 or abs(dx) + abs(dy) <= self.measurement_range:
+                Z.append([i, dx, dy])
+        return Z
+
+    def __repr__(self):
+        return 'Robot: [x=%.5f y=%.5f]' % (self.x, self.y)
+
+
+# --------
+#
+# this routine makes the robot data, re-running until every landmark
+# has been observed. Returns the data and the robot (with its landmarks).
+#
+
+def make_data(N, num_landmarks, world_size, measurement_range, motion_noise,
+              measurement_noise, distance, rng=random):
+    complete = False
+
+    while not complete:
+
+        data = []
+
+        # make robot and landmarks
+        r = robot(world_size, measurement_range, motion_noise, measurement_noise, rng)
+        r.make_landmarks(num_landmarks)
+        seen = [False for row in range(num_landmarks)]
+
+        # guess an initial motion
+        orientation = rng.random() * 2.0 * pi
+        dx = cos(orientation) * distance
+        dy = sin(orientation) * distance
+
+        for k in range(N - 1):
+
+            # sense
+            Z = r.sense()
+
+            # check off all landmarks that were observed
+            for i in range(len(Z)):
+                seen[Z[i][0]] = True
+
+            # move
+            while not r.move(dx, dy):
+                # if we'd be leaving the robot world, pick instead a new direction
+                orientation = rng.random() * 2.0 * pi
+                dx = cos(orientation) * distance
+                dy = sin(orientation) * distance
+
+            # memorize data
+            data.append([Z, [dx, dy]])
+
+        # we are done when all landmarks were observed; otherwise re-run
+        complete = (sum(seen) == num_landmarks)
+
+    return data, r
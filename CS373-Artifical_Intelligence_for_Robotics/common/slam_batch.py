@@ -0,0 +1,144 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from common.slam import make_data, information_system, solve_information, OnlineSLAM
+
+
+# ------------------------------------------------
+#
+# batched SLAM runs for parameter sweeps
+#
+# A scenario is a dict with the make_data() parameters. Missing keys
+# take the values of the GraphSLAM exercises:
+#
+#   scenarios = [dict(N=20, motion_noise=m, measurement_noise=z)
+#                for m in [1.0, 2.0, 4.0] for z in [1.0, 2.0, 4.0]]
+#   results = run_scenarios(scenarios, seed=1)
+#   results['time'], results['mu'][0], ...
+#   residuals(results)        # mu against Omega and Xi, ~1e-12
+#
+# Every scenario gets its own seed derived from (seed, index), so the
+# results do not depend on the number of workers or on scheduling.
+#
+
+default_scenario = dict(N=20,
+                        num_landmarks=5,
+                        world_size=100.0,
+                        measurement_range=50.0,
+                        motion_noise=2.0,
+                        measurement_noise=2.0,
+                        distance=20.0)
+
+result_dtype = np.dtype([('seed', np.uint32),
+                         ('N', np.int64),
+                         ('num_landmarks', np.int64),
+                         ('motion_noise', np.float64),
+                         ('measurement_noise', np.float64),
+                         ('mu', object),
+                         ('Omega', object),
+                         ('Xi', object),
+                         ('time', np.float64)])
+
+
+# --------
+#
+# one independent seed per scenario
+#
+
+def scenario_seeds(seed, count):
+    states = np.random.SeedSequence(seed).spawn(count)
+    return [int(s.generate_state(1)[0]) for s in states]
+
+
+# --------
+#
+# runs one scenario: generates the world from its seed and solves it
+#
+#   mode='full'   - mu of all poses and landmarks, Omega is the sparse
+#                   one-axis information matrix (see common/slam.py)
+#   mode='online' - mu of the last pose and the landmarks, Omega is the
+#                   dense one-axis online information matrix
+#
+# mu is returned interlaced as [x0, y0, x1, y1, ...], Xi has one row per
+# pose or landmark and the x and y columns, in the order of mu: Omega
+# mu = Xi for each axis (see residuals()).
+#
+
+def run_scenario(scenario, seed, mode='full'):
+    p = dict(default_scenario)
+    p.update(scenario)
+    rng = random.Random(seed)
+
+    start = time.time()
+    data, r = make_data(p['N'], p['num_landmarks'], p['world_size'],
+                        p['measurement_range'], p['motion_noise'],
+                        p['measurement_noise'], p['distance'], rng)
+    if mode == 'full':
+        Omega, Xi = information_system(data, p['N'], p['num_landmarks'], p['motion_noise'],
+                                       p['measurement_noise'], p['world_size'])
+        mu = solve_information(Omega, Xi).ravel()
+    elif mode == 'online':
+        slam = OnlineSLAM(p['num_landmarks'], p['motion_noise'], p['measurement_noise'],
+                          p['world_size'])
+        for k in range(len(data)):
+            slam.sense(data[k][0])
+            slam.move(data[k][1])
+        mu = slam.estimate().value.ravel()
+        # OnlineSLAM keeps the pose last, mu has it first
+        order = slam._order()
+        Omega = slam.Omega[np.ix_(order, order)]
+        Xi = slam.Xi[order]
+    else:
+        raise ValueError("Unknown mode: " + str(mode))
+    elapsed = time.time() - start
+
+    return (seed, p['N'], p['num_landmarks'], p['motion_noise'], p['measurement_noise'],
+            mu, Omega, Xi, elapsed)
+
+
+def _run_scenario(args):
+    return run_scenario(*args)
+
+
+# --------
+#
+# runs all scenarios over a process pool and collects them into one
+# structured array (one row per scenario, in input order).
+# workers=1 runs them in this process.
+#
+
+def run_scenarios(scenarios, seed=0, mode='full', workers=None):
+    seeds = scenario_seeds(seed, len(scenarios))
+    tasks = [(scenarios[i], seeds[i], mode) for i in range(len(scenarios))]
+
+    if workers == 1:
+        rows = [_run_scenario(t) for t in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            rows = list(executor.map(_run_scenario, tasks))
+
+    results = np.empty(len(rows), dtype=result_dtype)
+    for i in range(len(rows)):
+        results[i] = rows[i]
+    return results
+
+
+# --------
+#
+# largest difference per result row between mu and the solution of its
+# Omega and Xi; zero up to rounding when the three are consistent
+#
+
+def residuals(results):
+    out = np.empty(len(results))
+    for i in range(len(results)):
+        Omega, Xi = results['Omega'][i], results['Xi'][i]
+        if isinstance(Omega, np.ndarray):
+            mu = np.linalg.solve(Omega, Xi)
+        else:
+            mu = solve_information(Omega, Xi)
+        out[i] = np.abs(mu.ravel() - results['mu'][i]).max()
+    return out
@@ -0,0 +1,206 @@
+import numpy as np
+
+
+# ------------------------------------------------
+#
+# path smoothing as one linear solve
+#
+# The smooth() loops of PID_Control/ repeat the gradient update
+#   y[i] += wd (x[i] - y[i]) + ws (y[i-1] + y[i+1] - 2 y[i])
+# until nothing changes. Where they stop, every free point satisfies
+#   (wd + 2 ws) y[i] - ws y[i-1] - ws y[i+1] = wd x[i]
+# and every fixed point y[i] = x[i]. With second_order=True (the two
+# extra 0.5 ws terms of Constrained_Smoothing.py and SegmentedCTE.py)
+# the rows reach two points to each side. That is the answer of the
+# simultaneous update, as Constrained_Smoothing.py computes it;
+# SegmentedCTE.py adds the three terms one after the other and its loop
+# stops at a slightly different path. The system is banded and solved
+# here directly for all coordinates at once:
+#   - open paths (first and last point fixed) with a banded LU,
+#   - cyclic paths, whose rows wrap around, with a sparse LU.
+#
+#   newpath = smooth(path, weight_data=0.5, weight_smooth=0.1)
+#   newpath = smooth(path, 0.0, 0.1, fix=fix, cyclic=True, second_order=True)
+#
+# A batch of paths of the same length, shaped (B, n, d), is solved as
+# one system; fix is then (n,) for all of them or (B, n).
+#
+
+def smooth(path, weight_data=0.5, weight_smooth=0.1, fix=None, cyclic=False,
+           second_order=False):
+    import scipy.linalg
+    import scipy.sparse
+    import scipy.sparse.linalg
+    x = np.asarray(path, dtype=float)
+    batch = x.ndim == 3
+    if not batch:
+        x = x[None]
+    B, n, d = x.shape
+    if n < 3:
+        return np.array(path, dtype=float)
+
+    fixed = np.zeros((B, n), dtype=bool)
+    if fix is not None:
+        fixed[:] = np.asarray(fix, dtype=bool)
+    if not cyclic:
+        fixed[:, 0] = fixed[:, -1] = True
+    if weight_data == 0.0 and not fixed.any(axis=1).all():
+        raise ValueError("Smoothing without weight_data needs a fixed point in every path")
+
+    coefficients = stencil(n, weight_data, weight_smooth, cyclic, second_order)
+    offsets = sorted(coefficients)
+
+    # one row per point of every path; fixed rows are the identity
+    rhs = weight_data * x
+    rhs[fixed] = x[fixed]
+    rhs = rhs.reshape(B * n, d)
+    free = ~fixed.ravel()
+    diagonals = {}
+    for k in offsets:
+        c = np.tile(coefficients[k], B)
+        c[~free] = 1.0 if k == 0 else 0.0
+        diagonals[k] = c
+
+    if cyclic:
+        rows = np.arange(B * n)
+        i = rows % n
+        start = rows - i
+        A = scipy.sparse.coo_matrix(
+            (np.concatenate([diagonals[k] for k in offsets]),
+             (np.tile(rows, len(offsets)),
+              np.concatenate([start + (i + k) % n for k in offsets]))),
+            shape=(B * n, B * n)).tocsc()
+        y = scipy.sparse.linalg.splu(A).solve(rhs)
+    else:
+        # solve_banded layout: ab[u + i - j, j] = A[i, j]
+        u = offsets[-1]
+        ab = np.zeros((2 * u + 1, B * n))
+        for k in offsets:
+            if k >= 0:
+                ab[u - k, k:] = diagonals[k][:B * n - k]
+            else:
+                ab[u - k, :k] = diagonals[k][-k:]
+        y = scipy.linalg.solve_banded((u, u), ab, rhs, overwrite_ab=True, overwrite_b=True,
+                                      check_finite=False)
+
+    y = y.reshape(B, n, d)
+    return y if batch else y[0]
+
+
+# --------
+#
+# coefficients of row i for each offset k, as (n,) arrays. The second
+# order terms of open paths only exist where i - 2 (or i + 2) does, as
+# in SegmentedCTE.py.
+#
+
+def stencil(n, weight_data, weight_smooth, cyclic=False, second_order=False):
+    ws = weight_smooth
+    c = {k: np.zeros(n) for k in ([-2, -1, 0, 1, 2] if second_order else [-1, 0, 1])}
+    c[0] += weight_data + 2.0 * ws
+    c[-1] -= ws
+    c[1] -= ws
+    if second_order:
+        i = np.arange(n)
+        left = 0.5 * ws * (cyclic | (i >= 2))
+        right = 0.5 * ws * (cyclic | (i <= n - 3))
+        c[0] += left + right
+        c[-1] -= 2.0 * left
+        c[-2] += left
+        c[1] -= 2.0 * right
+        c[2] += right
+    return c
+
+
+# ------------------------------------------------
+#
+# streaming smoother for paths that keep growing
+#
+# Points are appended one at a time or from any iterable. Only the
+# pending points near the tail are kept, with their raw values. Every
+# `window` new points, the tail is smoothed with smooth() with the
+# newest point held fixed, as the last point of an open path is; the
+# last smoothed point(s) already emitted are held fixed at the other
+# end. Points that are then more than `window` points behind the newest
+# one are emitted and no longer change. With weight_data > 0 the
+# influence of the tail on a point decays geometrically with the
+# distance, so for a long enough window the emitted points equal those
+# of smooth() on the whole path. Without weight_data (the setting of
+# Constrained_Smoothing.py) it does not decay at all, so that is
+# rejected.
+# Memory and the work per point do not depend on the path length.
+#
+#   s = StreamingSmoother(weight_data=0.5, weight_smooth=0.1, window=32)
+#   for point in s.extend(waypoints):     # stable smoothed points
+#       ...
+#   s.append(point)                       # list of the points it released
+#   rest = s.flush()                      # end of the path
+#
+
+class StreamingSmoother:
+
+    def __init__(self, weight_data=0.5, weight_smooth=0.1, window=32, second_order=False):
+        if weight_data <= 0.0:
+            raise ValueError("Streaming smoothing needs weight_data > 0")
+        self.weight_data = weight_data
+        self.weight_smooth = weight_smooth
+        self.window = window
+        self.second_order = second_order
+        self.boundary = []      # last emitted points, smoothed
+        self.pending = []       # raw points not emitted yet
+        self.emitted = 0
+
+    def append(self, point):
+        return list(self.extend([point]))
+
+    def extend(self, points):
+        for point in points:
+            point = np.array(point, dtype=float)
+            if self.emitted == 0 and not self.boundary:
+                # the first point of an open path is fixed
+                for out in self._emit([point]):
+                    yield out
+                continue
+            self.pending.append(point)
+            if len(self.pending) >= 2 * self.window:
+                for out in self._release(len(self.pending) - self.window):
+                    yield out
+
+    # --------
+    #
+    # smooths the pending points with the newest one fixed, then emits
+    # all of them
+    #
+
+    def flush(self):
+        return list(self._release(len(self.pending)))
+
+    # --------
+    #
+    # smoothed pending points as they stand now (not final)
+    #
+
+    def tail(self):
+        if not self.pending:
+            return np.zeros((0, len(self.boundary[0]) if self.boundary else 0))
+        return self._solve()[len(self.boundary):]
+
+    def _solve(self):
+        path = np.array(self.boundary + self.pending)
+        fix = np.zeros(len(path), dtype=bool)
+        fix[:len(self.boundary)] = True
+        return smooth(path, self.weight_data, self.weight_smooth, fix,
+                      second_order=self.second_order)
+
+    def _release(self, count):
+        if count <= 0:
+            return []
+        smoothed = self._solve()[len(self.boundary):]
+        del self.pending[:count]
+        return self._emit(list(smoothed[:count]))
+
+    def _emit(self, points):
+        keep = 2 if self.second_order else 1
+        self.boundary = (self.boundary + points)[-keep:]
+        self.emitted += len(points)
+        return points
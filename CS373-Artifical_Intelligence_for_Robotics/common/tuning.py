@@ -0,0 +1,156 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+# ------------------------------------------------
+#
+# parallel coordinate descent for controller gains (twiddle)
+#
+# twiddle() of PID_Control/twiddle.py tries p[i] + dp[i], then
+# p[i] - dp[i], one run at a time. The search here is the same: every
+# round is a pass over the coordinates, each one starting from the point
+# the previous coordinates reached; p[i] + dp[i] is taken if it beats the
+# current error, else p[i] - dp[i] if that does, and dp[i] grows by
+# `grow` when one of them was taken and shrinks by `shrink` otherwise.
+# Only the runs are parallel: both sides of a coordinate, over all
+# seeds, go to the process pool together. That costs the p[i] - dp[i]
+# runs twiddle() would have skipped, but for a deterministic cost the
+# search visits the same points as twiddle().
+#
+# cost(params, seed) returns the error of one run and must seed its own
+# random numbers from seed. A candidate costs the mean over all seeds;
+# the same seeds are used for every candidate, so noisy runs are
+# compared on equal terms. Results are cached by (params, seed).
+#
+# With batch=True, cost(params, seeds) takes all runs of a round at once
+# as an (n, len(params)) array and a list of n seeds, and returns their
+# n errors; it runs in this process (e.g. pid.twiddle_errors).
+#
+#   with Tuner(cost, seeds=range(10), workers=4) as tuner:
+#       params, err = tuner.tune([0.0, 0.0, 0.0], tol=0.001)
+#   tuner.rounds, tuner.evaluations, tuner.hits
+#
+# The search stops when sum(dp) < tol, err <= target, after max_rounds,
+# or after `patience` rounds that lowered err by less than min_delta.
+#
+
+class Tuner:
+
+    def __init__(self, cost, seeds=(0,), workers=None, decimals=12, batch=False):
+        self.cost = cost
+        self.batch = batch
+        self.seeds = list(seeds)
+        self.workers = workers
+        self.decimals = decimals
+        self.cache = {}
+        self.evaluations = 0
+        self.hits = 0
+        self.rounds = 0
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def key(self, params):
+        return tuple(np.round(np.asarray(params, dtype=float), self.decimals).tolist())
+
+    # --------
+    #
+    # mean cost of every candidate; runs that are not cached yet go to
+    # the pool in one batch
+    #
+
+    def evaluate(self, candidates):
+        keys = [self.key(p) for p in candidates]
+        tasks = []
+        queued = set()
+        for k in keys:
+            for seed in self.seeds:
+                if (k, seed) in self.cache or (k, seed) in queued:
+                    self.hits += 1
+                else:
+                    queued.add((k, seed))
+                    tasks.append((k, seed))
+
+        if tasks:
+            if self.batch:
+                errors = self.cost(np.array([k for k, seed in tasks]),
+                                   [seed for k, seed in tasks])
+            elif self.workers == 1 or len(tasks) == 1:
+                errors = [self.cost(list(k), seed) for k, seed in tasks]
+            else:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers)
+                errors = list(self._executor.map(_call, [self.cost] * len(tasks), tasks))
+            for i in range(len(tasks)):
+                self.cache[tasks[i]] = float(errors[i])
+            self.evaluations += len(tasks)
+
+        return np.array([np.mean([self.cache[(k, seed)] for seed in self.seeds])
+                         for k in keys])
+
+    # --------
+    #
+    # the search; returns the best params and their error
+    #
+
+    def tune(self, params, dp=None, tol=0.001, grow=1.1, shrink=0.9, target=None,
+             max_rounds=None, patience=None, min_delta=0.0):
+        p = np.array(params, dtype=float)
+        n = len(p)
+        dp = np.ones(n) if dp is None else np.array(dp, dtype=float)
+        best_err = self.evaluate([p])[0]
+        stale = 0
+        self.rounds = 0
+
+        while dp.sum() > tol:
+            if target is not None and best_err <= target:
+                break
+            if max_rounds is not None and self.rounds >= max_rounds:
+                break
+            if patience is not None and stale >= patience:
+                break
+
+            previous = best_err
+            for i in range(n):
+                step = np.zeros(n)
+                step[i] = dp[i]
+                candidates = [p + step, p - step]
+                errors = self.evaluate(candidates)
+                if errors[0] < best_err:
+                    p, best_err = candidates[0], errors[0]
+                    dp[i] *= grow
+                elif errors[1] < best_err:
+                    p, best_err = candidates[1], errors[1]
+                    dp[i] *= grow
+                else:
+                    dp[i] *= shrink
+
+            self.rounds += 1
+            stale = stale + 1 if previous - best_err <= min_delta else 0
+
+        return p.tolist(), float(best_err)
+
+
+def _call(cost, task):
+    return cost(list(task[0]), task[1])
+
+
+# --------
+#
+# one-shot tuning, closing the pool afterwards
+#
+
+def twiddle(cost, params, dp=None, tol=0.001, seeds=(0,), workers=None, batch=False,
+            **options):
+    with Tuner(cost, seeds, workers, batch=batch) as tuner:
+        return tuner.tune(params, dp, tol, **options)
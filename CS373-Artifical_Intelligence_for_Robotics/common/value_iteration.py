@@ -0,0 +1,216 @@
+from math import *
+
+import numpy as np
+
+from common.planning import GridPlanner, delta4, delta_name
+
+
+# ------------------------------------------------
+#
+# dynamic programming on grids with NumPy arrays
+#
+# The value grid is a float array. A Bellman backup of every cell at once
+# reads the values of the neighbours in one direction as a shifted view
+# of a copy padded with a border (the value of leaving the grid), so one
+# sweep is a handful of array operations instead of a Python double loop.
+#
+# For deterministic costs the value is just the cost-to-go, which the
+# 'dijkstra' method gets in one pass over the moves (see GridPlanner);
+# method='iterate' does shifted-array sweeps until nothing changes.
+#
+#   value = compute_value(grid, goal, cost)
+#   policy = optimum_policy(grid, goal, cost)
+#   value, policy = stochastic_value(grid, goal, cost_step,
+#                                    collision_cost, success_prob)
+#
+
+# --------
+#
+# copy of value with a border of fill around it
+#
+
+def pad(value, fill):
+    padded = np.full((value.shape[0] + 2, value.shape[1] + 2), fill, dtype=float)
+    padded[1:-1, 1:-1] = value
+    return padded
+
+
+# --------
+#
+# view of the padded values at the neighbour (dx, dy) of every cell
+#
+
+def neighbours(padded, dx, dy):
+    rows, cols = padded.shape
+    return padded[1 + dx:rows - 1 + dx, 1 + dy:cols - 1 + dy]
+
+
+# --------
+#
+# value grid: minimum cost to reach the goal, unreachable cells and walls
+# get the value unreachable
+#
+
+def compute_value(grid, goal, cost, method='dijkstra', unreachable=99):
+    grid = np.asarray(grid)
+    free = grid == 0
+
+    if method == 'dijkstra':
+        value = GridPlanner(grid, cost).cost_to_go(goal)
+    elif method == 'iterate':
+        value = np.full(grid.shape, inf)
+        value[goal[0], goal[1]] = 0.0
+        while True:
+            padded = pad(value, inf)
+            best = value.copy()
+            for dx, dy in delta4:
+                np.minimum(best, neighbours(padded, dx, dy) + cost, out=best)
+            best[~free] = inf
+            best[goal[0], goal[1]] = 0.0
+            if np.array_equal(best, value):
+                break
+            value = best
+    else:
+        raise ValueError("Unknown method: " + str(method))
+
+    value = np.where(np.isinf(value), unreachable, value)
+    value[goal[0], goal[1]] = 0.0
+    return value
+
+
+# --------
+#
+# policy grid: the move to the cheapest neighbour, ' ' where the goal
+# cannot be reached, '*' at the goal
+#
+
+def optimum_policy(grid, goal, cost, method='dijkstra'):
+    grid = np.asarray(grid)
+    value = compute_value(grid, goal, cost, method, unreachable=inf)
+    value[grid != 0] = inf
+    value[goal[0], goal[1]] = 0.0
+
+    padded = pad(value, inf)
+    moves = np.array([neighbours(padded, dx, dy) for dx, dy in delta4])
+    names = np.array(delta_name[:len(delta4)])
+    policy = np.where(np.isfinite(value), names[np.argmin(moves, axis=0)], ' ')
+    policy[goal[0], goal[1]] = '*'
+    return policy
+
+
+# --------
+#
+# one synchronous backup of the stochastic motion model of
+# StochasticMotion.py: the robot moves as commanded with success_prob
+# and to either side with (1 - success_prob) / 2; hitting a wall or the
+# border costs collision_cost. Returns the action values (4, rows, cols).
+#
+
+def stochastic_backup(value, free, cost_step, collision_cost, success_prob):
+    failure_prob = (1.0 - success_prob) / 2.0
+    padded = pad(np.where(free, value, collision_cost), collision_cost)
+    shifted = [neighbours(padded, dx, dy) for dx, dy in delta4]
+    n = len(delta4)
+    Q = np.empty((n,) + value.shape)
+    for a in range(n):
+        Q[a] = cost_step + success_prob * shifted[a] \
+            + failure_prob * (shifted[(a - 1) % n] + shifted[(a + 1) % n])
+    return Q
+
+
+# --------
+#
+# lower bound of the stochastic value used as a starting point: no
+# trajectory is cheaper than the shortest path or than colliding
+#
+
+def stochastic_lower_bound(grid, goal, cost_step, collision_cost):
+    steps = GridPlanner(grid).cost_to_go(goal)
+    bound = np.full(steps.shape, float(collision_cost))
+    reachable = np.isfinite(steps)
+    bound[reachable] = np.minimum(collision_cost, steps[reachable] * cost_step)
+    return bound
+
+
+# --------
+#
+# best action value of the stochastic model from the neighbour values,
+# written into out; vertical and horizontal are work buffers of the same
+# shape. Going up or down both slip left or right, so with
+# h = left + right
+#   min(Q_up, Q_down) = p * min(up, down) + f * h
+# and likewise for left and right.
+#
+
+def best_backup(up, left, down, right, cost_step, collision_cost, success_prob,
+                out, vertical, horizontal):
+    failure_prob = (1.0 - success_prob) / 2.0
+    np.add(up, down, out=vertical)
+    np.add(left, right, out=horizontal)
+    np.minimum(up, down, out=out)
+    out *= success_prob
+    horizontal *= failure_prob
+    out += horizontal
+    np.minimum(left, right, out=horizontal)
+    horizontal *= success_prob
+    vertical *= failure_prob
+    horizontal += vertical
+    np.minimum(out, horizontal, out=out)
+    out += cost_step
+    np.minimum(out, collision_cost, out=out)
+    return out
+
+
+# --------
+#
+# policy of a stochastic value grid: the best action, ' ' where no action
+# beats collision_cost, '*' at the goal
+#
+
+def stochastic_policy(value, free, goal, cost_step, collision_cost, success_prob):
+    Q = stochastic_backup(value, free, cost_step, collision_cost, success_prob)
+    names = np.array(delta_name[:len(delta4)])
+    policy = np.where(free & (Q.min(axis=0) < collision_cost),
+                      names[np.argmin(Q, axis=0)], ' ')
+    policy[goal[0], goal[1]] = '*'
+    return policy
+
+
+# --------
+#
+# stochastic value iteration until no cell changes by more than tol.
+# Returns value and policy like StochasticMotion.py; cells that never
+# beat collision_cost keep ' ' as policy.
+#
+# Every sweep runs in preallocated buffers on shifted views of one padded
+# array; the full action values are formed once for the policy.
+#
+
+def stochastic_value(grid, goal, cost_step, collision_cost, success_prob,
+                     tol=1e-9, max_iter=1000000):
+    grid = np.asarray(grid)
+    free = grid == 0
+    free[goal[0], goal[1]] = True
+    blocked = ~free
+
+    value = stochastic_lower_bound(grid, goal, cost_step, collision_cost)
+    value[blocked] = collision_cost
+    padded = pad(value, collision_cost)
+    value = padded[1:-1, 1:-1]
+    up, left, down, right = [neighbours(padded, dx, dy) for dx, dy in delta4]
+    vertical, horizontal, best, change = [np.empty(value.shape) for i in range(4)]
+
+    for iteration in range(max_iter):
+        best_backup(up, left, down, right, cost_step, collision_cost, success_prob,
+                    best, vertical, horizontal)
+        best[blocked] = collision_cost
+        best[goal[0], goal[1]] = 0.0
+
+        np.subtract(best, value, out=change)
+        np.abs(change, out=change)
+        value[...] = best
+        if change.max() <= tol:
+            break
+
+    policy = stochastic_policy(value, free, goal, cost_step, collision_cost, success_prob)
+    return value.copy(), policy
@@ -0,0 +1,138 @@
+import hashlib
+import heapq
+from collections import OrderedDict
+from math import *
+
+import numpy as np
+
+from common.planning import GridPlanner, delta8
+
+
+# ------------------------------------------------
+#
+# warehouse planner for PracticeExame/WarehouseRobot.py
+#
+# The robot walks from the dropzone to a box and back, so a delivery
+# costs twice the distance between the two. Every box distance comes out
+# of one distance field from the dropzone (Dijkstra over the free cells,
+# 8-connected, diagonal steps 1.5): a box is entered from its cheapest
+# free neighbour. Picking a box frees its cell, which can only shorten
+# distances; the field is then repaired by a Dijkstra started from that
+# cell alone instead of being recomputed.
+#
+# The field of every warehouse as given is cached per layout (free cells
+# and dropzone), so planning another todo list on the same warehouse
+# starts from the cached field.
+#
+#   cost = plan(warehouse, dropzone, todo)
+#
+
+straight_cost = 1.0
+diagonal_cost = 1.5
+
+field_cache = OrderedDict()
+field_cache_size = 16
+
+
+class WarehousePlanner:
+
+    def __init__(self, warehouse, dropzone):
+        self.rows = len(warehouse)
+        self.cols = len(warehouse[0])
+        self.W = self.cols + 2
+        self.dropzone = list(dropzone)
+
+        # padded flat layout: row r, col c lives at (r + 1) * W + c + 1
+        self.free = np.zeros((self.rows + 2, self.W), dtype=bool)
+        self.boxes = {}
+        for r in range(self.rows):
+            for c in range(self.cols):
+                cell = warehouse[r][c]
+                if cell == 0 or cell == 'x':
+                    self.free[r + 1, c + 1] = True
+                else:
+                    self.boxes[cell] = (r + 1) * self.W + c + 1
+        self.free[dropzone[0] + 1, dropzone[1] + 1] = True
+
+        self.steps = [(dr * self.W + dc, diagonal_cost if dr and dc else straight_cost)
+                      for dr, dc in delta8]
+        self.field = self.cached_field()
+
+    def layout_key(self):
+        digest = hashlib.sha1(self.free.tobytes())
+        return (self.rows, self.cols, tuple(self.dropzone), digest.hexdigest())
+
+    # --------
+    #
+    # distance field of the current layout as a flat list, from the cache
+    # or computed from scratch
+    #
+
+    def cached_field(self):
+        key = self.layout_key()
+        if key in field_cache:
+            field_cache.move_to_end(key)
+            return list(field_cache[key])
+        planner = GridPlanner(self.free[1:-1, 1:-1] == 0, connectivity=8,
+                              diagonal_cost=diagonal_cost)
+        field = np.full(self.free.shape, inf)
+        field[1:-1, 1:-1] = planner.cost_to_go(self.dropzone)
+        field = field.ravel().tolist()
+        field_cache[key] = tuple(field)
+        if len(field_cache) > field_cache_size:
+            field_cache.popitem(last=False)
+        return field
+
+    # --------
+    #
+    # distance from the dropzone to the cell i (reached from its
+    # cheapest free neighbour)
+    #
+
+    def distance(self, i):
+        if self.free.flat[i]:
+            return self.field[i]
+        return min(self.field[i - offset] + step for offset, step in self.steps)
+
+    # --------
+    #
+    # removes box from the map and repairs the distance field: only the
+    # cells that get closer through the freed cell are touched
+    #
+
+    def remove(self, box):
+        i = self.boxes.pop(box)
+        field = self.field
+        field[i] = self.distance(i)
+        self.free.flat[i] = True
+
+        free = self.free.ravel()
+        open = [(field[i], i)]
+        while open:
+            d, j = heapq.heappop(open)
+            if d > field[j]:
+                continue
+            for offset, step in self.steps:
+                k = j + offset
+                if free[k] and d + step < field[k]:
+                    field[k] = d + step
+                    heapq.heappush(open, (d + step, k))
+
+    # --------
+    #
+    # total cost of delivering the boxes of todo in order
+    #
+
+    def plan(self, todo):
+        cost = 0.0
+        for box in todo:
+            d = self.distance(self.boxes[box])
+            if d == inf:
+                raise ValueError("Box %s cannot be reached" % box)
+            cost += 2.0 * d
+            self.remove(box)
+        return cost
+
+
+def plan(warehouse, dropzone, todo):
+    return WarehousePlanner(warehouse, dropzone).plan(todo)
@@ -38,9 +38,14 @@ def move(p, U):
     return q
 
     
-for j in range(len(measurements)):
-    p = sense(p, measurements[j])
-    p = move(p, motions[j])
-    
-print p
+if __name__ == '__main__':
+    for j in range(len(measurements)):
+        p = sense(p, measurements[j])
+        p = move(p, motions[j])
+
+    print p
+
 
+    # common/histogram.py runs the same filter on NumPy arrays:
+    #   f = HistogramFilter(world, pHit, pMiss)
+    #   f.sense(Z); f.move(step_kernel(U, pExact, pUndershoot, pOvershoot))